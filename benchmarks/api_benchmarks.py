@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+"""
+Benchmarks of the public functions of organizations/api.py at production scale.
+
+Seeds an SQLite database with organizations and organization-course linkages
+(10,000 and 1,000,000 by default), then times each benchmarked API call,
+counting its database queries and measuring its peak Python memory use.
+Course key validation is benchmarked too, on 100,000 strings and CourseKeys,
+next to a baseline which parses every key, as validation did before memoization.
+Calls which write are run in a transaction which is rolled back afterwards,
+so that every repetition starts from the same data.
+
+Results are printed as a table and written as JSON, so that runs can be compared:
+
+    $ python benchmarks/api_benchmarks.py --output before.json
+    $ python benchmarks/api_benchmarks.py --organizations 1000 --linkages 50000
+
+Seeding the default dataset takes about a minute; pass ``--database`` to keep
+the seeded database and reuse it across runs.
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEED_BATCH_SIZE = 10000
+LOOKUP_COUNT = 1000
+# Course key validation is measured on 100k calls over 6k distinct keys, as
+# in a bulk import which repeats courses across organizations.
+VALIDATION_COUNT = 100000
+VALIDATION_DISTINCT_KEYS = 6000
+
+
+def setup_django(database_path):
+    """
+    Configure Django like the test suite does, with the database at `database_path`.
+    """
+    sys.path.insert(0, REPO_ROOT)
+    import test_settings  # pylint: disable=import-outside-toplevel
+
+    django_settings = {name: getattr(test_settings, name) for name in dir(test_settings) if name.isupper()}
+    django_settings['DATABASES'] = {
+        'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': database_path},
+    }
+    settings.configure(**django_settings)
+    django.setup()
+
+
+def course_id(organization_index, course_index):
+    """
+    Return the course id of a seeded linkage.
+    """
+    return f'course-v1:Org{organization_index}+C{course_index}+Run'
+
+
+def seed(organization_count, linkage_count):
+    """
+    Create the organizations and linkages, unless the database already has them.
+    """
+    from django.core.management import call_command  # pylint: disable=import-outside-toplevel
+    from django.db import transaction  # pylint: disable=import-outside-toplevel
+
+    from organizations.models import Organization, OrganizationCourse  # pylint: disable=import-outside-toplevel
+
+    call_command('migrate', verbosity=0)
+    if Organization.objects.exists():
+        if (Organization.objects.count(), OrganizationCourse.objects.count()) != (organization_count, linkage_count):
+            sys.exit("The database holds a different dataset; please use another --database.")
+        return
+
+    print(f"Seeding {organization_count} organizations and {linkage_count} linkages...", file=sys.stderr)
+    with transaction.atomic():
+        Organization.objects.bulk_create(
+            (
+                Organization(short_name=f'Org{index}', name=f'Organization {index}', description='')
+                for index in range(organization_count)
+            ),
+            batch_size=SEED_BATCH_SIZE,
+        )
+        organization_ids = list(Organization.objects.order_by('id').values_list('id', flat=True))
+        for start in range(0, linkage_count, SEED_BATCH_SIZE):
+            OrganizationCourse.objects.bulk_create(
+                OrganizationCourse(
+                    organization_id=organization_ids[index % organization_count],
+                    course_id=course_id(index % organization_count, index // organization_count),
+                )
+                for index in range(start, min(start + SEED_BATCH_SIZE, linkage_count))
+            )
+
+
+def benchmarks(organization_count, linkage_count):
+    """
+    Return a list of (name, function) pairs, each function making one API call.
+    """
+    from opaque_keys import InvalidKeyError  # pylint: disable=import-outside-toplevel
+    from opaque_keys.edx.keys import CourseKey  # pylint: disable=import-outside-toplevel
+
+    from organizations import api, validators  # pylint: disable=import-outside-toplevel
+
+    courses_per_organization = max(linkage_count // organization_count, 1)
+    organization = api.get_organization_by_short_name('Org1')
+    course_key = CourseKey.from_string(course_id(1, 0))
+    short_names = [f'Org{index}' for index in range(min(LOOKUP_COUNT, organization_count))]
+    organization_ids = [organization['id'] + index for index in range(len(short_names))]
+    course_keys = [
+        CourseKey.from_string(course_id(index % organization_count, index // organization_count))
+        for index in range(min(LOOKUP_COUNT, linkage_count))
+    ]
+    # Half of the organizations and linkages to add already exist.
+    new_organizations = [
+        {'short_name': f'Org{index}', 'name': f'Organization {index}'}
+        for index in range(organization_count - LOOKUP_COUNT // 2, organization_count + LOOKUP_COUNT // 2)
+    ]
+    new_linkages = [
+        (organization, CourseKey.from_string(course_id(1, course_index)))
+        for course_index in range(
+            max(courses_per_organization - LOOKUP_COUNT // 2, 0),
+            courses_per_organization + LOOKUP_COUNT // 2,
+        )
+    ]
+    validation_strings = [
+        course_id(index % organization_count, index // organization_count)
+        for index in range(VALIDATION_DISTINCT_KEYS)
+    ] * (VALIDATION_COUNT // VALIDATION_DISTINCT_KEYS + 1)
+    validation_strings = validation_strings[:VALIDATION_COUNT]
+    validation_keys = [CourseKey.from_string(key) for key in validation_strings[:VALIDATION_DISTINCT_KEYS]]
+    validation_keys = (validation_keys * (VALIDATION_COUNT // VALIDATION_DISTINCT_KEYS + 1))[:VALIDATION_COUNT]
+
+    def parse_course_key(key):
+        # Course key validation before memoization: parse every key, even parsed ones.
+        try:
+            CourseKey.from_string(str(key))
+        except (InvalidKeyError, UnicodeDecodeError):
+            return False
+        return True
+
+    def validate_strings():
+        # Start from an empty cache, so that each run pays the first parse of every distinct key.
+        validators._course_key_string_is_valid.cache_clear()  # pylint: disable=protected-access
+        return all(map(validators.course_key_is_valid, validation_strings))
+
+    return [
+        ('get_organization', lambda: api.get_organization(organization['id'])),
+        ('get_organization_by_short_name', lambda: api.get_organization_by_short_name('Org1')),
+        ('get_organizations', api.get_organizations),
+        ('get_organizations_by_short_names', lambda: api.get_organizations_by_short_names(short_names)),
+        ('get_organizations_by_ids', lambda: api.get_organizations_by_ids(organization_ids)),
+        ('get_organization_courses', lambda: api.get_organization_courses(organization)),
+        ('get_course_organizations', lambda: api.get_course_organizations(course_key)),
+        ('get_course_organization', lambda: api.get_course_organization(course_key)),
+        ('get_course_organization_id', lambda: api.get_course_organization_id(course_key)),
+        ('get_organizations_for_courses', lambda: api.get_organizations_for_courses(course_keys)),
+        ('get_course_organization_ids', lambda: api.get_course_organization_ids(course_keys)),
+        ('ensure_organization', lambda: api.ensure_organization('Org1')),
+        ('add_organization', lambda: api.add_organization({'short_name': 'NewOrg', 'name': 'New'})),
+        ('add_organization_course', lambda: api.add_organization_course(organization, CourseKey.from_string(
+            'course-v1:Org1+New+Run'
+        ))),
+        ('remove_organization_course', lambda: api.remove_organization_course(organization, course_key)),
+        ('bulk_add_organizations[dry_run]', lambda: api.bulk_add_organizations(new_organizations, dry_run=True)),
+        ('bulk_add_organizations', lambda: api.bulk_add_organizations(new_organizations)),
+        ('bulk_add_organization_courses[dry_run]', lambda: api.bulk_add_organization_courses(
+            new_linkages, dry_run=True
+        )),
+        ('bulk_add_organization_courses', lambda: api.bulk_add_organization_courses(new_linkages)),
+        ('bulk_remove_organization_courses', lambda: api.bulk_remove_organization_courses(new_linkages)),
+        ('remove_course_references', lambda: api.remove_course_references(course_key)),
+        ('bulk_remove_course_references', lambda: api.bulk_remove_course_references(course_keys)),
+        ('remove_organization', lambda: api.remove_organization(organization['id'])),
+        ('course_key_is_valid[baseline, 100k strings]', lambda: all(map(parse_course_key, validation_strings))),
+        ('course_key_is_valid[100k strings]', validate_strings),
+        ('course_key_is_valid[baseline, 100k CourseKeys]', lambda: all(map(parse_course_key, validation_keys))),
+        ('course_key_is_valid[100k CourseKeys]', lambda: all(map(validators.course_key_is_valid, validation_keys))),
+    ]
+
+
+def run_once(function, trace_memory=False):
+    """
+    Call `function` in a rolled-back transaction.
+
+    Returns a tuple of (elapsed seconds, number of queries, peak traced bytes or None).
+    """
+    from django.db import connection, transaction  # pylint: disable=import-outside-toplevel
+    from django.test.utils import CaptureQueriesContext  # pylint: disable=import-outside-toplevel
+
+    peak_memory = None
+    with transaction.atomic():
+        with CaptureQueriesContext(connection) as queries:
+            if trace_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start
+            if trace_memory:
+                peak_memory = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+        transaction.set_rollback(True)
+    return elapsed, len(queries), peak_memory
+
+
+def run_benchmark(name, function, repeat):
+    """
+    Time `function` over `repeat` runs, then measure its memory use in a separate run.
+    """
+    run_once(function)  # Warm up.
+    timings = []
+    query_counts = set()
+    for _ in range(repeat):
+        elapsed, query_count, _ = run_once(function)
+        timings.append(elapsed * 1000)
+        query_counts.add(query_count)
+    # Tracing memory slows calls down, so it is kept out of the timings.
+    _, _, peak_memory = run_once(function, trace_memory=True)
+    return {
+        'name': name,
+        'latency_ms': {
+            'min': round(min(timings), 3),
+            'median': round(statistics.median(timings), 3),
+            'max': round(max(timings), 3),
+        },
+        'queries': max(query_counts),
+        'peak_memory_kib': round(peak_memory / 1024, 1),
+    }
+
+
+def main():
+    """
+    Seed the database, run the benchmarks, and report the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--organizations', type=int, default=10000, help="Number of organizations to seed.")
+    parser.add_argument('--linkages', type=int, default=1000000, help="Number of organization-course linkages to seed.")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of timed runs of each benchmark.")
+    parser.add_argument('--database', help="SQLite database to seed or reuse. By default, a temporary file.")
+    parser.add_argument('--output', default='benchmark-results.json', help="File to write the JSON results to.")
+    parser.add_argument('--filter', default='', help="Only run the benchmarks whose name contains this string.")
+    args = parser.parse_args()
+    if args.organizations < LOOKUP_COUNT or args.linkages < args.organizations:
+        parser.error(f"Please seed at least {LOOKUP_COUNT} organizations, and at least as many linkages.")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        setup_django(args.database or os.path.join(temp_dir, 'benchmarks.db'))
+        seed(args.organizations, args.linkages)
+
+        results = []
+        for name, function in benchmarks(args.organizations, args.linkages):
+            if args.filter in name:
+                result = run_benchmark(name, function, args.repeat)
+                results.append(result)
+                print(
+                    f"{name:<48} {result['latency_ms']['median']:>10.3f} ms {result['queries']:>6} queries "
+                    f"{result['peak_memory_kib']:>12.1f} KiB"
+                )
+
+    with open(args.output, 'w', encoding='utf-8') as output:
+        json.dump({
+            'metadata': {
+                'date': datetime.now(timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'sqlite': sqlite3.sqlite_version,
+                'organizations': args.organizations,
+                'linkages': args.linkages,
+                'repeat': args.repeat,
+            },
+            'results': results,
+        }, output, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,10 @@
 """ Django admin pages for organization models """
+from django.conf import settings
 from django.contrib import admin, messages
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from organizations import caching, data
 from organizations.models import Organization, OrganizationCourse
 
 
@@ -11,12 +14,33 @@ class ActivateDeactivateAdminMixin:
 
     Hides the delete_selected actions; we'd much rows are deactivated than
     deleted.
+
+    By default, the bulk actions update the rows without writing to the model's
+    history table. With the ``ORGANIZATIONS_ADMIN_AUDITED_BULK_ACTIONS`` setting,
+    they also write the history records in bulk, on behalf of the acting user.
     """
 
     HISTORY_DISCLAIMER = _(
         "Please note: as a bulk action, this will not be reflected in the model's history table."
     )
 
+    @staticmethod
+    def _audited():
+        """ Return whether the bulk actions write to the model's history table. """
+        return getattr(settings, 'ORGANIZATIONS_ADMIN_AUDITED_BULK_ACTIONS', False)
+
+    def _set_active(self, request, queryset, active):
+        """
+        Set the `active` field of the selected entries, and return their count.
+        """
+        if self._audited():
+            return data.bulk_set_records_active(queryset, active, user=request.user)
+        count = queryset.count()
+        queryset.update(active=active, modified=timezone.now())
+        caching.clear_organization_cache()
+        caching.invalidate_course_organizations()
+        return count
+
     def get_actions(self, request):
         """ Return set of Django admin actions, removing the delete action """
         actions = super().get_actions(request)
@@ -32,8 +56,7 @@ class ActivateDeactivateAdminMixin:
     )
     def activate_selected(self, request, queryset):
         """ Activate the selected entries. """
-        count = queryset.count()
-        queryset.update(active=True)
+        count = self._set_active(request, queryset, True)
         model_name = self.__class__.__name__
 
         if count == 1:
@@ -42,15 +65,15 @@ class ActivateDeactivateAdminMixin:
             message = _('{count} {model_name} entries were successfully activated.')
         message = message.format(count=count, model_name=model_name)  # pylint: disable=no-member
         self.message_user(request, message)
-        self.message_user(request, self.HISTORY_DISCLAIMER, level=messages.WARNING)
+        if not self._audited():
+            self.message_user(request, self.HISTORY_DISCLAIMER, level=messages.WARNING)
 
     @admin.action(
         description=_('Deactivate selected entries')
     )
     def deactivate_selected(self, request, queryset):
         """ Deactivate the selected entries. """
-        count = queryset.count()
-        queryset.update(active=False)
+        count = self._set_active(request, queryset, False)
         model_name = self.__class__.__name__
 
         if count == 1:
@@ -59,7 +82,8 @@ class ActivateDeactivateAdminMixin:
             message = _('{count} {model_name} entries were successfully deactivated.')
         message = message.format(count=count, model_name=model_name)  # pylint: disable=no-member
         self.message_user(request, message)
-        self.message_user(request, self.HISTORY_DISCLAIMER, level=messages.WARNING)
+        if not self._audited():
+            self.message_user(request, self.HISTORY_DISCLAIMER, level=messages.WARNING)
 
 
 @admin.register(Organization)
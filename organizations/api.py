@@ -13,6 +13,7 @@ from django.conf import settings
 from . import data
 from . import exceptions
 from . import validators
+from .instrumentation import instrument
 
 
 log = logging.getLogger(__name__)
@@ -40,7 +41,34 @@ def _validate_organization_data(organization_data):
         )
 
 
+def _validate_organization_course_pairs(organization_course_pairs):
+    """ Validation helper; returns the pairs as a list """
+    organization_course_pairs = list(organization_course_pairs)
+    for organization_data, course_key in organization_course_pairs:
+        _validate_organization_data(organization_data)
+        if "short_name" not in organization_data:
+            raise exceptions.InvalidOrganizationException(
+                f"Organization is missing short_name: {organization_data}"
+            )
+        _validate_course_key(course_key)
+    return organization_course_pairs
+
+
+def _validated_organization_data_items(organization_data_items):
+    """
+    Lazily validate organization dictionaries for bulk creation, yielding them back.
+    """
+    for organization_data in organization_data_items:
+        _validate_organization_data(organization_data)
+        if "short_name" not in organization_data:
+            raise exceptions.InvalidOrganizationException(
+                f"Organization is missing short_name: {organization_data}"
+            )
+        yield organization_data
+
+
 # PUBLIC FUNCTIONS
+@instrument
 def add_organization(organization_data):
     """
     Passes a new organization to the data layer for storage
@@ -50,7 +78,15 @@ def add_organization(organization_data):
     return organization
 
 
-def bulk_add_organizations(organization_data_items, dry_run=False, activate=True):
+@instrument
+def bulk_add_organizations(  # pylint: disable=too-many-positional-arguments
+        organization_data_items,
+        dry_run=False,
+        activate=True,
+        batch_size=None,
+        progress_callback=None,
+        counts_only=False,
+):
     """
     Efficiently store multiple organizations.
 
@@ -89,16 +125,37 @@ def bulk_add_organizations(organization_data_items, dry_run=False, activate=True
             If False, missing organizations will be created with active=False,
             and existing-but-inactive organizations will be left as inactive.
 
+        batch_size (int|None):
+            Optional, defaulting to None.
+            If given, `organization_data_items` may be any iterable (e.g. a generator
+            streaming a large file); it is validated and stored `batch_size` items
+            at a time, so memory use does not grow with the number of items.
+            Each batch is committed on its own: if an item is invalid, the
+            batches before it have already been stored.
+            If None, all items are validated before anything is stored.
+
+        progress_callback (callable|None):
+            Optional, defaulting to None.
+            If given, called after each batch as
+            `progress_callback(processed_count, created_count, reactivated_count)`.
+
+        counts_only (bool):
+            Optional, defaulting to False.
+            If True, return the numbers of created and reactivated organizations
+            instead of their short names, so that streaming a large file does
+            not keep every short name in memory.
+
     Raises:
         InvalidOrganizationException: One or more organization dictionaries
-            have missing or invalid data; no organizations were created.
+            have missing or invalid data; no organizations were created
+            (unless `batch_size` was given; see above).
 
-    Returns: tuple[set[str], set[str]]
+    Returns: tuple[set[str], set[str]] | tuple[int, int]
 
         A tuple in the form: (
             short names of organizations that were newly created,
             short names of organizations that we reactivated
-        )
+        ), or of their counts if `counts_only` is True.
         If `activate` was supplied as False, the set of reactivated linkages will
         always be empty.
 
@@ -107,17 +164,21 @@ def bulk_add_organizations(organization_data_items, dry_run=False, activate=True
         that were *reactivated*. We distinguish between them in the return
         value to allow for richer reporting by users of this function.
     """
-    for organization_data in organization_data_items:
-        _validate_organization_data(organization_data)
-        if "short_name" not in organization_data:
-            raise exceptions.InvalidOrganizationException(
-                f"Organization is missing short_name: {organization_data}"
-            )
+    organization_data_items = _validated_organization_data_items(organization_data_items)
+    if not batch_size:
+        # Validate everything before storing anything.
+        organization_data_items = list(organization_data_items)
     return data.bulk_create_organizations(
-        organization_data_items, dry_run=dry_run, activate=activate
+        organization_data_items,
+        dry_run=dry_run,
+        activate=activate,
+        batch_size=batch_size,
+        progress_callback=progress_callback,
+        counts_only=counts_only,
     )
 
 
+@instrument
 def edit_organization(organization_data):
     """
     Passes an updated organization to the data layer for storage
@@ -126,6 +187,7 @@ def edit_organization(organization_data):
     return data.update_organization(organization_data)
 
 
+@instrument
 def get_organization(organization_id):
     """
     Retrieves the specified organization
@@ -133,13 +195,32 @@ def get_organization(organization_id):
     return data.fetch_organization(organization_id)
 
 
-def get_organization_by_short_name(organization_short_name):
+@instrument
+def get_organization_by_short_name(organization_short_name, case_insensitive=False):
     """
     Retrieves the organization filtered by short name
+
+    If `case_insensitive`, the short name is matched regardless of case,
+    through the same index-backed lookup as the bulk functions.
     """
-    return data.fetch_organization_by_short_name(organization_short_name)
+    return data.fetch_organization_by_short_name(organization_short_name, case_insensitive=case_insensitive)
 
 
+@instrument
+def get_organization_logo_status(organization_id):
+    """
+    Retrieves the state of the latest download of an organization's logo
+    from a `logo_url` given to the v0 API.
+
+    Returns: dict or None
+        Has the `source_url`, the `status` (one of 'pending', 'succeeded'
+        and 'failed'), the number of download `attempts`, the last `error`
+        and when it was `modified`; None if no logo was ever requested.
+    """
+    return data.fetch_organization_logo_status(organization_id)
+
+
+@instrument
 def get_organizations():
     """
     Retrieves the active organizations managed by the system
@@ -147,6 +228,37 @@ def get_organizations():
     return data.fetch_organizations()
 
 
+@instrument
+def get_organizations_by_short_names(organization_short_names):
+    """
+    Retrieves the active organizations with the given short names, matched case-insensitively.
+
+    Arguments:
+        organization_short_names (iterable[str])
+
+    Returns: dict[str, dict]
+        Maps each given short name to its organization's data.
+        Short names that match no active organization are left out.
+    """
+    return data.fetch_organizations_by_short_names(organization_short_names)
+
+
+@instrument
+def get_organizations_by_ids(organization_ids):
+    """
+    Retrieves the active organizations with the given ids.
+
+    Arguments:
+        organization_ids (iterable[int])
+
+    Returns: dict[int, dict]
+        Maps each given id to its organization's data.
+        Ids that match no active organization are left out.
+    """
+    return data.fetch_organizations_by_ids(organization_ids)
+
+
+@instrument
 def remove_organization(organization_id):
     """
     Removes the specified organization
@@ -157,6 +269,7 @@ def remove_organization(organization_id):
     data.delete_organization(organization)
 
 
+@instrument
 def add_organization_course(organization_data, course_key):
     """
     Adds a organization-course link to the system
@@ -169,6 +282,7 @@ def add_organization_course(organization_data, course_key):
     )
 
 
+@instrument
 def bulk_add_organization_courses(
         organization_course_pairs,
         dry_run=False,
@@ -228,18 +342,50 @@ def bulk_add_organization_courses(
         We distinguish between them in the return value to allow for richer
         reporting by users of this function.
     """
-    for organization_data, course_key in organization_course_pairs:
-        _validate_organization_data(organization_data)
-        if "short_name" not in organization_data:
-            raise exceptions.InvalidOrganizationException(
-                f"Organization is missing short_name: {organization_data}"
-            )
-        _validate_course_key(course_key)
+    organization_course_pairs = _validate_organization_course_pairs(organization_course_pairs)
     return data.bulk_create_organization_courses(
         organization_course_pairs, dry_run=dry_run, activate=activate
     )
 
 
+@instrument
+def bulk_remove_organization_courses(organization_course_pairs, dry_run=False):
+    """
+    Efficiently deactivate multiple organization-course relationships.
+
+    Note: No `pre_save` or `post_save` signals for `OrganizationCourse` will be
+    triggered, as the linkages are updated in bulk.
+
+    Arguments:
+
+        organization_course_pairs (iterable[tuple[dict, CourseKey]]):
+
+            An iterable of (organization_data, course_key) pairs.
+
+            We will ensure that these organization-course linkages are inactive.
+            Linkages that do not exist or are already inactive are skipped.
+
+        dry_run (bool):
+            Optional, defaulting to False.
+            If True, don't apply changes, but still return organization-course
+            linkages that would have been deactivated.
+
+    Raises:
+        InvalidOrganizationException: One or more organization dictionaries
+            have missing or invalid data.
+        InvalidCourseKeyException: One or more course keys could not be parsed.
+        (in case of either exception, no org-course linkages are deactivated).
+
+    Returns: set[tuple[str, str]]
+
+        The organization-course linkages that we deactivated, as
+        (lowercased organization short name, course key string) pairs.
+    """
+    organization_course_pairs = _validate_organization_course_pairs(organization_course_pairs)
+    return data.bulk_delete_organization_courses(organization_course_pairs, dry_run=dry_run)
+
+
+@instrument
 def get_organization_courses(organization_data):
     """
     Retrieves the set of courses for a given organization
@@ -249,6 +395,7 @@ def get_organization_courses(organization_data):
     return data.fetch_organization_courses(organization=organization_data)
 
 
+@instrument
 def remove_organization_course(organization, course_key):
     """
     Removes the specfied course from the specified organization
@@ -258,6 +405,7 @@ def remove_organization_course(organization, course_key):
     return data.delete_organization_course(course_key=course_key, organization=organization)
 
 
+@instrument
 def get_course_organizations(course_key):
     """
     Retrieves the set of organizations for a given course
@@ -267,6 +415,7 @@ def get_course_organizations(course_key):
     return data.fetch_course_organizations(course_key=course_key)
 
 
+@instrument
 def get_course_organization(course_key):
     """
     Returns the first organization linked to a given course,
@@ -279,6 +428,7 @@ def get_course_organization(course_key):
     return None
 
 
+@instrument
 def get_course_organization_id(course_key):
     """
     Returns the id of the first organization linked to a given course,
@@ -288,6 +438,43 @@ def get_course_organization_id(course_key):
     return course_org["id"] if course_org else None
 
 
+@instrument
+def get_organizations_for_courses(course_keys):
+    """
+    Retrieves the organizations linked to each of the given courses.
+
+    Arguments:
+        course_keys (iterable[CourseKey|str])
+
+    Raises:
+        InvalidCourseKeyException: One or more course keys could not be parsed.
+
+    Returns: dict[CourseKey|str, list[dict]]
+        Maps each given course key to the list of organizations linked to it,
+        in the order they were linked (an empty list if there are none).
+    """
+    course_keys = list(course_keys)
+    for course_key in course_keys:
+        _validate_course_key(course_key)
+    return data.fetch_organizations_for_courses(course_keys)
+
+
+@instrument
+def get_course_organization_ids(course_keys):
+    """
+    Batch form of ``get_course_organization_id``.
+
+    Returns: dict[CourseKey|str, int|None]
+        Maps each given course key to the id of the first organization linked
+        to it, or None if the course is not linked to any organizations.
+    """
+    return {
+        course_key: organizations[0]["id"] if organizations else None
+        for course_key, organizations in get_organizations_for_courses(course_keys).items()
+    }
+
+
+@instrument
 def remove_course_references(course_key):
     """
     Removes course references from application state
@@ -297,6 +484,29 @@ def remove_course_references(course_key):
     data.delete_course_references(course_key)
 
 
+@instrument
+def bulk_remove_course_references(course_keys):
+    """
+    Removes the references to many courses from application state at once.
+
+    Arguments:
+        course_keys (iterable[CourseKey|str])
+
+    Returns: dict[CourseKey|str, int]
+        Maps each given course key to the number of organization-course
+        linkages which were removed.
+
+    Raises:
+        InvalidCourseKeyException: if any of the course keys is invalid,
+            in which case nothing is removed.
+    """
+    course_keys = list(course_keys)
+    for course_key in course_keys:
+        _validate_course_key(course_key)
+    return data.bulk_delete_course_references(course_keys)
+
+
+@instrument
 def ensure_organization(organization_short_name):
     """
     Ensure that an organization with the given short name exists.
@@ -305,6 +515,10 @@ def ensure_organization(organization_short_name):
     If the organization does not exist, then:
         (a) If auto-create is enabled, create & return a new organization.
         (b) If auto-create is disabled, raise an InvalidOrganizationException.
+    Inactive organizations are likewise reactivated, or rejected.
+
+    Concurrent calls for the same new organization are safe: the losing call
+    returns the organization created by the winning one.
 
     Arguments:
         organization_short_name (str)
@@ -315,18 +529,41 @@ def ensure_organization(organization_short_name):
     Raises:
         InvalidOrganizationException (only if auto-create is disabled)
     """
-    try:
-        return get_organization_by_short_name(organization_short_name)
-    except exceptions.InvalidOrganizationException:
-        if not is_autocreate_enabled():
-            raise
-    log.info("Automatically creating new organization '%s'.", organization_short_name)
-    return add_organization({
-        "short_name": organization_short_name,
-        "name": organization_short_name,
-    })
+    organization, created = data.ensure_organization(
+        organization_short_name, create=is_autocreate_enabled()
+    )
+    if created:
+        log.info("Automatically created new organization '%s'.", organization_short_name)
+    return organization
+
+
+@instrument
+def ensure_organizations(organization_short_names):
+    """
+    Ensure that organizations with the given short names exist, matching them case-insensitively.
+
+    Missing organizations are created in bulk (and inactive ones reactivated)
+    if auto-create is enabled; otherwise, an InvalidOrganizationException is
+    raised if any organization is missing or inactive.
+
+    Arguments:
+        organization_short_names (iterable[str])
+
+    Returns: dict[str, dict]
+        Maps each given short name to its organization's data.
+
+    Raises:
+        InvalidOrganizationException (only if auto-create is disabled)
+    """
+    organizations, created_short_names = data.ensure_organizations(
+        organization_short_names, create=is_autocreate_enabled()
+    )
+    if created_short_names:
+        log.info("Automatically created new organizations: %s.", ', '.join(sorted(created_short_names)))
+    return organizations
 
 
+@instrument
 def is_autocreate_enabled():
     """
     Return whether automatic organization creation is enabled.
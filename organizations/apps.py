@@ -0,0 +1,16 @@
+"""
+App configuration for the organizations app.
+"""
+from django.apps import AppConfig
+
+
+class OrganizationsConfig(AppConfig):
+    """
+    Configuration for the organizations Django application.
+    """
+    name = 'organizations'
+    verbose_name = 'Organizations'
+
+    def ready(self):
+        # Connect signal receivers.
+        from organizations import receivers  # pylint: disable=unused-import,import-outside-toplevel
@@ -0,0 +1,307 @@
+"""
+Caching helpers for the data layer.
+
+Only data.py (and the signal receivers / admin actions that invalidate
+its caches) should use this module. Cached values are the plain Python
+structures returned by data.py, never model instances or querysets.
+
+Process-local organization cache
+    Enabled by the ``ORGANIZATIONS_LOCAL_CACHE_ENABLED`` setting (off by default).
+    Entries expire after ``ORGANIZATIONS_LOCAL_CACHE_TIMEOUT`` seconds, and at most
+    ``ORGANIZATIONS_LOCAL_CACHE_MAX_SIZE`` entries are kept, evicting the least
+    recently used ones first. Since the cache lives in each process, writes made by
+    other processes only become visible once the affected entries expire. A
+    transaction which has written organizations neither reads nor fills the cache
+    until it commits, so that its uncommitted rows are never cached.
+
+Shared course-organizations cache
+    Enabled by the ``ORGANIZATIONS_COURSE_CACHE_ENABLED`` setting (off by default).
+    Stores the organizations linked to each course in the Django cache named by
+    ``ORGANIZATIONS_CACHE_ALIAS`` (default: ``'default'``), so that it is shared by
+    every process using that cache. Entries are keyed by a generation counter which
+    every writer of organization-course linkages bumps; entries written under an
+    older generation are never read again and simply expire after
+    ``ORGANIZATIONS_COURSE_CACHE_TIMEOUT`` seconds.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+DEFAULT_LOCAL_CACHE_TIMEOUT = 300
+DEFAULT_LOCAL_CACHE_MAX_SIZE = 1024
+DEFAULT_COURSE_CACHE_TIMEOUT = 3600
+
+COURSE_ORGANIZATIONS_GENERATION_KEY = 'organizations.course_organizations.generation'
+
+
+class LocalTTLCache:
+    """
+    A small, thread-safe, process-local cache with per-entry expiry and
+    least-recently-used eviction.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Return the value stored under `key`, or None if it is missing or expired.
+        """
+        with self._lock:
+            try:
+                expires_at, value = self._entries[key]
+            except KeyError:
+                return None
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout, max_size):
+        """
+        Store `value` under `key` for `timeout` seconds, evicting the least
+        recently used entries so that no more than `max_size` are kept.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Drop every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+_organization_cache = LocalTTLCache()
+_organization_cache_generation = 0
+
+
+def organization_cache_enabled():
+    """
+    Return whether the process-local organization cache is enabled.
+    """
+    return bool(getattr(settings, 'ORGANIZATIONS_LOCAL_CACHE_ENABLED', False))
+
+
+def get_cached_organization(lookup, value):
+    """
+    Return a copy of the organization dict cached for the given lookup
+    (e.g. ``('short_name', 'edX')``), or None on a miss.
+    """
+    if not organization_cache_enabled() or organizations_written_in_transaction():
+        return None
+    organization = _organization_cache.get((lookup, value))
+    return dict(organization) if organization is not None else None
+
+
+def cache_organization(lookup, value, organization):
+    """
+    Cache a copy of an organization dict for the given lookup.
+    """
+    if not organization_cache_enabled() or organizations_written_in_transaction():
+        return
+    _organization_cache.set(
+        (lookup, value),
+        dict(organization),
+        timeout=getattr(settings, 'ORGANIZATIONS_LOCAL_CACHE_TIMEOUT', DEFAULT_LOCAL_CACHE_TIMEOUT),
+        max_size=getattr(settings, 'ORGANIZATIONS_LOCAL_CACHE_MAX_SIZE', DEFAULT_LOCAL_CACHE_MAX_SIZE),
+    )
+
+
+def _clear_local_organization_cache():
+    """
+    Drop every entry of the process-local organization cache, and move on to a new generation.
+    """
+    global _organization_cache_generation  # pylint: disable=global-statement
+    _organization_cache.clear()
+    _organization_cache_generation += 1
+
+
+def organizations_written_in_transaction():
+    """
+    Return whether the current transaction has written organizations which are not committed yet.
+
+    Such writes are those which cleared the cache in an atomic block: the
+    clear scheduled on commit is pending until the transaction commits, and
+    dropped if the transaction (or the savepoint of the write) is rolled back.
+    """
+    connection = transaction.get_connection()
+    return connection.in_atomic_block and any(
+        entry[1] is _clear_local_organization_cache for entry in connection.run_on_commit
+    )
+
+
+def clear_organization_cache():
+    """
+    Invalidate every entry of the process-local organization cache.
+
+    Organizations change rarely, so we drop the whole cache rather than
+    tracking which keys (id, old and new short name) a write affected.
+    This also tells the organization registry (see registry.py) to check
+    for changes on its next read.
+
+    Call this after any write to organizations that bypasses model signals.
+    """
+    _clear_local_organization_cache()
+    if transaction.get_connection().in_atomic_block and not organizations_written_in_transaction():
+        # Other threads may cache the old rows until the writing transaction
+        # commits, so clear once more at that point.
+        transaction.on_commit(_clear_local_organization_cache)
+
+
+def organization_cache_generation():
+    """
+    Return a number which changes whenever the process-local organization cache is cleared.
+    """
+    return _organization_cache_generation
+
+
+def course_organizations_cache_enabled():
+    """
+    Return whether the shared course-organizations cache is enabled.
+    """
+    return bool(getattr(settings, 'ORGANIZATIONS_COURSE_CACHE_ENABLED', False))
+
+
+def _shared_cache():
+    """
+    Return the Django cache backing the shared caches of this app.
+    """
+    return caches[getattr(settings, 'ORGANIZATIONS_CACHE_ALIAS', 'default')]
+
+
+def _new_generation():
+    """
+    Return a fresh generation number.
+
+    If the generation key is evicted from the cache, restarting from a
+    clock-based value (rather than 1) makes sure we never go back to a
+    generation whose entries may still be cached.
+    """
+    return int(time.time() * 1000)
+
+
+def course_organizations_generation():
+    """
+    Return the current generation of the course-organizations cache,
+    or None if the cache is disabled.
+
+    Read the generation *before* querying the database, and cache the
+    results under it, so that a write which happens in between is never
+    masked by the stale results.
+    """
+    if not course_organizations_cache_enabled():
+        return None
+    cache = _shared_cache()
+    generation = cache.get(COURSE_ORGANIZATIONS_GENERATION_KEY)
+    if generation is None:
+        cache.add(COURSE_ORGANIZATIONS_GENERATION_KEY, _new_generation(), timeout=None)
+        generation = cache.get(COURSE_ORGANIZATIONS_GENERATION_KEY)
+    return generation
+
+
+def _course_organizations_key(generation, course_id):
+    """
+    Cache key for the organizations of a course.
+
+    Course ids are hashed, as they may be longer than, or contain characters
+    not allowed in, keys of some cache backends (e.g. memcached).
+    """
+    digest = hashlib.sha1(course_id.encode('utf-8')).hexdigest()
+    return f'organizations.course_organizations.{generation}.{digest}'
+
+
+def get_cached_course_organizations(generation, course_id):
+    """
+    Return the cached list of organization dicts for a course id, or None on a miss.
+    """
+    if generation is None:
+        return None
+    return _shared_cache().get(_course_organizations_key(generation, course_id))
+
+
+def cache_course_organizations(generation, course_id, organizations):
+    """
+    Cache the list of organization dicts for a course id under `generation`.
+    """
+    if generation is None:
+        return
+    _shared_cache().set(
+        _course_organizations_key(generation, course_id),
+        organizations,
+        timeout=getattr(settings, 'ORGANIZATIONS_COURSE_CACHE_TIMEOUT', DEFAULT_COURSE_CACHE_TIMEOUT),
+    )
+
+
+def get_many_cached_course_organizations(generation, course_ids):
+    """
+    Return a dict mapping the cached course ids among `course_ids` to their
+    lists of organization dicts.
+    """
+    if generation is None:
+        return {}
+    course_ids_by_key = {
+        _course_organizations_key(generation, course_id): course_id for course_id in course_ids
+    }
+    return {
+        course_ids_by_key[key]: organizations
+        for key, organizations in _shared_cache().get_many(course_ids_by_key).items()
+    }
+
+
+def cache_many_course_organizations(generation, organizations_by_course_id):
+    """
+    Cache lists of organization dicts, given as a dict keyed by course id, under `generation`.
+    """
+    if generation is None:
+        return
+    _shared_cache().set_many(
+        {
+            _course_organizations_key(generation, course_id): organizations
+            for course_id, organizations in organizations_by_course_id.items()
+        },
+        timeout=getattr(settings, 'ORGANIZATIONS_COURSE_CACHE_TIMEOUT', DEFAULT_COURSE_CACHE_TIMEOUT),
+    )
+
+
+def _bump_course_organizations_generation():
+    """
+    Move the course-organizations cache to a new generation.
+    """
+    cache = _shared_cache()
+    try:
+        cache.incr(COURSE_ORGANIZATIONS_GENERATION_KEY)
+    except ValueError:
+        # The generation key is missing (never set, or evicted).
+        cache.add(COURSE_ORGANIZATIONS_GENERATION_KEY, _new_generation(), timeout=None)
+
+
+def invalidate_course_organizations():
+    """
+    Invalidate every entry of the shared course-organizations cache.
+
+    Call this after any write to organization-course linkages (or to the
+    organizations they embed) that bypasses model signals.
+    """
+    if not course_organizations_cache_enabled():
+        return
+    _bump_course_organizations_generation()
+    if transaction.get_connection().in_atomic_block:
+        # Readers may cache the old rows under the new generation until the
+        # writing transaction commits, so move on once more at that point.
+        transaction.on_commit(_bump_course_organizations_generation)
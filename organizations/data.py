@@ -1,4 +1,3 @@
-# pylint: disable=expression-not-assigned
 """
 Application data management/abstraction layer.  Responsible for:
 
@@ -23,26 +22,37 @@ else:
     import organizations.resources as remote
 """
 import logging
+from collections import Counter
+from itertools import islice
 
+from django.db import IntegrityError, connection, transaction
 from django.db.models.functions import Lower
+from django.utils import timezone
 
+from . import caching
 from . import exceptions
 from . import models as internal
 from . import serializers
+from .registry import organization_registry, registry_enabled
 
 
 log = logging.getLogger(__name__)
 
+# Maximum number of values we pass to a single `__in` lookup.
+QUERY_CHUNK_SIZE = 500
+
 
 # PRIVATE/INTERNAL METHODS (public methods located further down)
-def _activate_record(record):
+def _chunks(items, size=None):
     """
-    Enables database records by setting the 'active' attribute to True
-    The queries in this module filter out inactive records as part of their criteria
-    This effectively allows us to soft-delete records so they are not lost forever
+    Split an iterable into lists of at most `size` (default: `QUERY_CHUNK_SIZE`) items.
     """
-    record.active = True
-    record.save()
+    size = size or QUERY_CHUNK_SIZE
+    iterator = iter(items)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
 
 
 def _inactivate_record(record):
@@ -55,39 +65,49 @@ def _inactivate_record(record):
     record.save()
 
 
+def _bulk_set_active(model, active, user=None, **filters):
+    """
+    Sets the 'active' attribute of the records of `model` matching `filters` with a
+    single update, then reads the changed records back (by the `modified` time of the
+    update) to write their history records in bulk, on behalf of `user` if given
+    Model signals are not sent, so callers must invalidate the caches themselves
+    Returns the list of changed records
+    """
+    modified = timezone.now()
+    if not model.objects.filter(active=not active, **filters).update(active=active, modified=modified):
+        return []
+    records = list(model.objects.filter(active=active, modified=modified, **filters))
+    model.history.bulk_history_create(records, update=True, default_user=user, default_date=modified)
+    return records
+
+
 def _activate_organization(organization_id):
     """
     Activates an inactivated (soft-deleted) organization as well as any inactive relationships
     """
-    [_activate_organization_course_relationship(record) for record
-     in internal.OrganizationCourse.objects.filter(organization_id=organization_id, active=False)]
+    _activate_organizations([organization_id])
 
-    [_activate_record(record) for record
-     in internal.Organization.objects.filter(id=organization_id, active=False)]
 
-
-def _inactivate_organization(organization_id):
+def _activate_organizations(organization_ids):
     """
-    Inactivates an activated organization as well as any active relationships
+    Activates inactivated (soft-deleted) organizations as well as any of their inactive relationships
     """
-    [_inactivate_organization_course_relationship(record) for record
-     in internal.OrganizationCourse.objects.filter(organization_id=organization_id, active=True)]
-
-    [_inactivate_record(record) for record
-     in internal.Organization.objects.filter(id=organization_id, active=True)]
+    for ids in _chunks(organization_ids):
+        # The organizations go first, as only relationships of active organizations may be activated.
+        _bulk_set_active(internal.Organization, True, id__in=ids)
+        _bulk_set_active(internal.OrganizationCourse, True, organization_id__in=ids)
+    caching.clear_organization_cache()
+    caching.invalidate_course_organizations()
 
 
-def _activate_organization_course_relationship(relationship):  # pylint: disable=invalid-name
+def _inactivate_organization(organization_id):
     """
-    Activates an inactive organization-course relationship
+    Inactivates an activated organization as well as any active relationships
     """
-    # If the relationship doesn't exist or the organization isn't active we'll want to raise an error
-    relationship = internal.OrganizationCourse.objects.get(
-        id=relationship.id,
-        active=False,
-        organization__active=True
-    )
-    _activate_record(relationship)
+    _bulk_set_active(internal.OrganizationCourse, False, organization_id=organization_id)
+    _bulk_set_active(internal.Organization, False, id=organization_id)
+    caching.clear_organization_cache()
+    caching.invalidate_course_organizations()
 
 
 def _inactivate_organization_course_relationship(relationship):  # pylint: disable=invalid-name
@@ -138,7 +158,14 @@ def create_organization(organization):
     return serializers.serialize_organization(organization)
 
 
-def bulk_create_organizations(organizations, dry_run=False, activate=True):
+def bulk_create_organizations(  # pylint: disable=too-many-positional-arguments
+        organizations,
+        dry_run=False,
+        activate=True,
+        batch_size=None,
+        progress_callback=None,
+        counts_only=False,
+):
     """
     Efficiently insert multiple organizations into the database.
 
@@ -160,6 +187,8 @@ def bulk_create_organizations(organizations, dry_run=False, activate=True):
 
             If multiple organizations share a `short_name`, the first organization
             in `organizations` will be used, and the latter ones ignored.
+            (Across batches, this is left to the database: an organization stored
+            by an earlier batch is found as existing by the later ones.)
 
         dry_run (bool):
             Optional, defaulting to False.
@@ -173,15 +202,77 @@ def bulk_create_organizations(organizations, dry_run=False, activate=True):
             If False, missing organizations will be created with active=False,
             and existing-but-inactivate organizations will be left as inactivate.
 
-    Returns: tuple[set[str], set[str]]
+        batch_size (int|None):
+            Optional, defaulting to None.
+            If given, `organizations` is consumed lazily and processed
+            `batch_size` items at a time, so that memory use does not grow with
+            the number of items, except for the returned sets of short names
+            (see `counts_only`) and, in a dry run, the short names seen so far.
+            If None, all organizations are processed as a single batch.
+
+        progress_callback (callable|None):
+            Optional, defaulting to None.
+            If given, called after each batch as
+            `progress_callback(processed_count, created_count, reactivated_count)`,
+            with counts accumulated over all batches so far.
+
+        counts_only (bool):
+            Optional, defaulting to False.
+            If True, return the numbers of created and reactivated organizations
+            instead of their short names, so that memory use stays bounded.
+
+    Returns: tuple[set[str], set[str]] | tuple[int, int]
 
         A tuple in the form: (
             short names of organizations that were newly created,
             short names of organizations that we reactivated
-        )
+        ), or of their counts if `counts_only` is True.
         If `activate` was supplied as False, the set of reactivated organizations
         will always be empty.
     """
+    if batch_size:
+        batches = _chunks(organizations, batch_size)
+    else:
+        batches = [list(organizations)]
+
+    short_names_of_created_organizations = set()
+    short_names_of_reactivated_organizations = set()
+    created_count = reactivated_count = processed_count = 0
+    # Lowered short names handled by earlier batches. Only a dry run needs
+    # them: otherwise, those organizations are in the database already.
+    seen_short_names = set()
+    for batch in batches:
+        organizations_by_short_name = _deduplicate_organizations(batch, activate, seen_short_names)
+        if dry_run:
+            seen_short_names.update(organizations_by_short_name)
+        created, reactivated = _bulk_create_organizations_batch(
+            organizations_by_short_name, dry_run=dry_run, activate=activate
+        )
+        if not counts_only:
+            short_names_of_created_organizations |= created
+            short_names_of_reactivated_organizations |= reactivated
+        created_count += len(created)
+        reactivated_count += len(reactivated)
+        processed_count += len(batch)
+        if progress_callback:
+            progress_callback(processed_count, created_count, reactivated_count)
+
+    if counts_only:
+        return created_count, reactivated_count
+    return (
+        short_names_of_created_organizations,
+        short_names_of_reactivated_organizations,
+    )
+
+
+def _deduplicate_organizations(organizations, activate, seen_short_names):
+    """
+    Deserialize a batch of organization dictionaries for `bulk_create_organizations`.
+
+    Returns a dict of unsaved Organization instances keyed by lowered short name,
+    dropping organizations whose short name was already seen in this batch or
+    is in `seen_short_names`.
+    """
     # Collect organizations by short name, dropping conflicts as necessary.
     organization_objs = [
         # This deserializes the dictionaries into Organization instances that
@@ -207,8 +298,25 @@ def bulk_create_organizations(organizations, dry_run=False, activate=True):
                 serializers.serialize_organization(org_with_same_short_name),
             )
             continue
+        if short_name_lower in seen_short_names:
+            log.info(
+                "Dropping organization from bulk_create batch, "
+                "as an organization with the same short_name was already "
+                "handled in an earlier batch. Dropped data: %r.",
+                serializers.serialize_organization(organization),
+            )
+            continue
         organizations_by_short_name[short_name_lower] = organization
+    return organizations_by_short_name
+
+
+def _bulk_create_organizations_batch(organizations_by_short_name, dry_run, activate):
+    """
+    Create or reactivate one batch of deduplicated organizations for `bulk_create_organizations`.
 
+    Returns a tuple of the sets of short names of organizations that
+    were created and that were reactivated.
+    """
     # Find out which organizations we need to reactivate vs. create.
     existing_organizations = query_organizations_by_short_name(organizations_by_short_name)
     existing_organization_short_names = {
@@ -239,8 +347,11 @@ def bulk_create_organizations(organizations, dry_run=False, activate=True):
     # re-activate existing organizations, and create the new ones.
     # If `activate==False`, then `organizations_to_reactivate` will be empty.
     if not dry_run:
-        organizations_to_reactivate.update(active=True)
+        # `update` bypasses `save`, so touch `modified` ourselves.
+        organizations_to_reactivate.update(active=True, modified=timezone.now())
         internal.Organization.objects.bulk_create(organizations_to_create)
+        # Neither `update` nor `bulk_create` sends `post_save`.
+        caching.clear_organization_cache()
 
     return (
         short_names_of_organizations_to_create,
@@ -248,6 +359,133 @@ def bulk_create_organizations(organizations, dry_run=False, activate=True):
     )
 
 
+def ensure_organization(organization_short_name, create=True):
+    """
+    Retrieves the active organization with the given short name from app/local state.
+    If it is missing or inactive and `create` is set, creates or reactivates it,
+    tolerating concurrent requests which create the same organization
+    Returns a tuple of a dictionary representation of the object, and whether it was created
+    """
+    organization = {'short_name': organization_short_name}
+    if not organization_short_name:
+        exceptions.raise_exception("organization", organization, exceptions.InvalidOrganizationException)
+    if registry_enabled():
+        record = organization_registry.get_by_short_name(organization_short_name)
+        if record is not None:
+            return record.to_dict(), False
+    else:
+        cached_organization = caching.get_cached_organization('short_name', organization_short_name)
+        if cached_organization is not None:
+            return cached_organization, False
+    # Inactive organizations are read too, so that they are reactivated rather than created again.
+    organization_obj = internal.Organization.objects.filter(short_name=organization_short_name).first()
+    created = False
+    if organization_obj is None:
+        if not create:
+            exceptions.raise_exception("organization", organization, exceptions.InvalidOrganizationException)
+        organization_obj = serializers.deserialize_organization({
+            'short_name': organization_short_name,
+            'name': organization_short_name,
+        })
+        try:
+            with transaction.atomic():
+                organization_obj.save()
+            created = True
+        except IntegrityError:
+            # Another request created the organization since we looked it up.
+            organization_obj = internal.Organization.objects.get(short_name=organization_short_name)
+    if not organization_obj.active:
+        if not create:
+            exceptions.raise_exception("organization", organization, exceptions.InvalidOrganizationException)
+        _activate_organization(organization_obj.id)
+    organization = serializers.serialize_organization(organization_obj)
+    if not registry_enabled():
+        caching.cache_organization('short_name', organization_short_name, organization)
+    return organization, created
+
+
+def ensure_organizations(organization_short_names, create=True):
+    """
+    Retrieves the active organizations with the given short names from app/local state.
+    Short names are matched case-insensitively, like `query_organizations_by_short_name`.
+    If any are missing or inactive and `create` is set, creates them in bulk and
+    reactivates them, otherwise raises for them
+    Returns a tuple of a dict mapping each given short name to a dictionary
+    representation of its organization, and the set of short names of created organizations
+    """
+    organization_short_names = set(organization_short_names)
+    if not all(organization_short_names):
+        exceptions.raise_exception(
+            "organization", {'short_name': ''}, exceptions.InvalidOrganizationException
+        )
+    organizations_by_lowered_short_name = {}
+    for short_names in _chunks(organization_short_names):
+        for organization_obj in query_organizations_by_short_name(short_names):
+            organizations_by_lowered_short_name[organization_obj.short_name.lower()] = organization_obj
+    missing_short_names = {}
+    for short_name in sorted(organization_short_names):
+        if short_name.lower() not in organizations_by_lowered_short_name:
+            missing_short_names.setdefault(short_name.lower(), short_name)
+    inactive_organizations = [
+        organization_obj
+        for organization_obj in organizations_by_lowered_short_name.values()
+        if not organization_obj.active
+    ]
+    if not create and (missing_short_names or inactive_organizations):
+        exceptions.raise_exception(
+            "organization",
+            {'short_name': sorted(missing_short_names.values()) + [org.short_name for org in inactive_organizations]},
+            exceptions.InvalidOrganizationException,
+        )
+
+    if inactive_organizations:
+        _activate_organizations([organization_obj.id for organization_obj in inactive_organizations])
+    organizations = {
+        short_name_lower: serializers.serialize_organization(organization_obj)
+        for short_name_lower, organization_obj in organizations_by_lowered_short_name.items()
+    }
+    created_short_names = set()
+    if missing_short_names:
+        organizations_to_create = [
+            serializers.deserialize_organization({'short_name': short_name, 'name': short_name})
+            for short_name in missing_short_names.values()
+        ]
+        try:
+            with transaction.atomic():
+                internal.Organization.objects.bulk_create(organizations_to_create)
+        except IntegrityError:
+            # Another request created some of the organizations since we looked them up,
+            # so fall back to ensuring them one at a time.
+            for short_name_lower, short_name in missing_short_names.items():
+                organizations[short_name_lower], created = ensure_organization(short_name)
+                if created:
+                    created_short_names.add(short_name)
+        else:
+            if any(organization_obj.pk is None for organization_obj in organizations_to_create):
+                # Not every database returns the ids of bulk-inserted rows.
+                organizations_to_create = [
+                    organization_obj
+                    for short_names in _chunks(missing_short_names.values())
+                    for organization_obj in query_organizations_by_short_name(short_names)
+                ]
+            internal.Organization.history.bulk_history_create(  # pylint: disable=no-member
+                organizations_to_create, default_date=timezone.now()
+            )
+            for organization_obj in organizations_to_create:
+                short_name_lower = organization_obj.short_name.lower()
+                organizations[short_name_lower] = serializers.serialize_organization(organization_obj)
+                created_short_names.add(organization_obj.short_name)
+            # `bulk_create` does not send `post_save`.
+            caching.clear_organization_cache()
+    return (
+        {
+            short_name: organizations[short_name.lower()]
+            for short_name in organization_short_names
+        },
+        created_short_names,
+    )
+
+
 def update_organization(organization):
     """
     Updates an existing organization in app/local state
@@ -266,6 +504,21 @@ def update_organization(organization):
     return serializers.serialize_organization(organization)
 
 
+def bulk_set_records_active(queryset, active, user=None):
+    """
+    Sets the 'active' attribute of every record of a queryset (of organizations or
+    organization-course relationships) with set-based updates, and writes their
+    history records in bulk, on behalf of `user` if given
+    Returns the number of records
+    """
+    record_ids = list(queryset.values_list('id', flat=True))
+    for ids in _chunks(record_ids):
+        _bulk_set_active(queryset.model, active, user, id__in=ids)
+    caching.clear_organization_cache()
+    caching.invalidate_course_organizations()
+    return len(record_ids)
+
+
 def delete_organization(organization):
     """
     Inactivates an existing organization from app/local state
@@ -283,28 +536,68 @@ def fetch_organization(organization_id):
     organization = {'id': organization_id}
     if not organization_id:
         exceptions.raise_exception("organization", organization, exceptions.InvalidOrganizationException)
+    if registry_enabled():
+        record = organization_registry.get_by_id(organization_id)
+        if record is None:
+            exceptions.raise_exception("organization", organization, exceptions.InvalidOrganizationException)
+        return record.to_dict()
+    cached_organization = caching.get_cached_organization('id', organization_id)
+    if cached_organization is not None:
+        return cached_organization
     organizations = serializers.serialize_organizations(
         internal.Organization.objects.filter(id=organization_id, active=True)
     )
     if not organizations:
         exceptions.raise_exception("organization", organization, exceptions.InvalidOrganizationException)
+    caching.cache_organization('id', organization_id, organizations[0])
     return organizations[0]
 
 
-def fetch_organization_by_short_name(organization_short_name):
+def fetch_organization_by_short_name(organization_short_name, case_insensitive=False):
     """
     Retrieves a specific organization from app/local state by short name
+    If `case_insensitive`, matches short names like `query_organizations_by_short_name`,
+    preferring an exact match if several organizations differ only by case
     Returns a dictionary representation of the object
     """
     organization = {'short_name': organization_short_name}
     if not organization_short_name:
         exceptions.raise_exception("organization", organization, exceptions.InvalidOrganizationException)
-    organizations = serializers.serialize_organizations(internal.Organization.objects.filter(
-        active=True, short_name=organization_short_name
-    ))
+    if registry_enabled():
+        record = organization_registry.get_by_short_name(organization_short_name, case_insensitive)
+        if record is None:
+            exceptions.raise_exception("organization", organization, exceptions.InvalidOrganizationException)
+        return record.to_dict()
+    if case_insensitive:
+        cache_lookup, cache_value = 'short_name_lowered', organization_short_name.lower()
+        queryset = query_organizations_by_short_name([organization_short_name])
+    else:
+        cache_lookup, cache_value = 'short_name', organization_short_name
+        queryset = internal.Organization.objects.filter(short_name=organization_short_name)
+    cached_organization = caching.get_cached_organization(cache_lookup, cache_value)
+    if cached_organization is not None:
+        return cached_organization
+    organizations = serializers.serialize_organizations(queryset.filter(active=True).order_by('id'))
     if not organizations:
         exceptions.raise_exception("organization", organization, exceptions.InvalidOrganizationException)
-    return organizations[0]
+    organization = next(
+        (match for match in organizations if match['short_name'] == organization_short_name),
+        organizations[0],
+    )
+    caching.cache_organization(cache_lookup, cache_value, organization)
+    return organization
+
+
+def fetch_organization_logo_status(organization_id):
+    """
+    Retrieves the state of the latest logo download of an organization
+    Returns a dictionary representation of the object, or None if the
+    organization's logo was never requested from a URL
+    """
+    logo_fetch = internal.OrganizationLogoFetch.objects.filter(organization_id=organization_id).first()
+    if logo_fetch is None:
+        return None
+    return serializers.serialize_organization_logo_fetch(logo_fetch)
 
 
 def fetch_organizations():
@@ -312,29 +605,105 @@ def fetch_organizations():
     Retrieves the set of active organizations from app/local state
     Returns a list-of-dicts representation of the object
     """
+    if registry_enabled():
+        return [record.to_dict() for record in organization_registry.all()]
     return serializers.serialize_organizations(internal.Organization.objects.filter(active=True))
 
 
+def fetch_organizations_by_short_names(organization_short_names):
+    """
+    Retrieves the active organizations with the given short names from app/local state.
+    Short names are matched case-insensitively, like `query_organizations_by_short_name`.
+    Returns a dict mapping each given short name to a dictionary representation of
+    its organization; short names with no active organization are left out.
+    """
+    organization_short_names = set(organization_short_names)
+    organizations_by_lowered_short_name = {}
+    for short_names in _chunks(organization_short_names):
+        for organization in query_organizations_by_short_name(short_names).filter(active=True):
+            organizations_by_lowered_short_name[organization.short_name.lower()] = (
+                serializers.serialize_organization(organization)
+            )
+    return {
+        short_name: dict(organizations_by_lowered_short_name[short_name.lower()])
+        for short_name in organization_short_names
+        if short_name.lower() in organizations_by_lowered_short_name
+    }
+
+
+def fetch_organizations_by_ids(organization_ids):
+    """
+    Retrieves the active organizations with the given ids from app/local state.
+    Returns a dict mapping each given id to a dictionary representation of
+    its organization; ids with no active organization are left out.
+    """
+    organization_ids = set(organization_ids)
+    organizations_by_id = {}
+    for ids in _chunks(organization_ids):
+        for organization in internal.Organization.objects.filter(id__in=ids, active=True):
+            organizations_by_id[str(organization.id)] = serializers.serialize_organization(organization)
+    return {
+        organization_id: organizations_by_id[str(organization_id)]
+        for organization_id in organization_ids
+        if str(organization_id) in organizations_by_id
+    }
+
+
 def create_organization_course(organization, course_key):
     """
-    Inserts a new organization-course relationship into app/local state
+    Inserts a new organization-course relationship into app/local state,
+    or reactivates it if it is inactive; only relationships of active
+    organizations may be reactivated
+    Both are done with a single upsert statement, so that concurrent callers
+    linking the same course do not conflict; an active relationship is left as-is
     No response currently defined for this operation
     """
     organization_obj = serializers.deserialize_organization(organization)
-    try:
-        relationship = internal.OrganizationCourse.objects.get(
-            organization=organization_obj,
-            course_id=str(course_key)
-        )
-        # If the relationship exists, but was inactivated, we can simply turn it back on
-        if not relationship.active:
-            _activate_organization_course_relationship(relationship)
-    except internal.OrganizationCourse.DoesNotExist:
-        relationship = internal.OrganizationCourse.objects.create(
+    course_id = str(course_key)
+    existing = internal.OrganizationCourse.objects.filter(
+        organization=organization_obj,
+        course_id=course_id,
+    ).values('id', 'created', 'active', 'organization__active').first()
+    if existing and existing['active']:
+        return
+    if existing and not existing['organization__active']:
+        exceptions.raise_exception("organization", organization, exceptions.InvalidOrganizationException)
+
+    now = timezone.now()
+    upsert_options = {'update_conflicts': True, 'update_fields': ['active', 'modified']}
+    # MySQL takes no conflict target, as it upserts on any unique key.
+    if connection.features.supports_update_conflicts_with_target:  # pragma: no branch
+        upsert_options['unique_fields'] = ['course_id', 'organization']
+    internal.OrganizationCourse.objects.bulk_create(
+        [
+            internal.OrganizationCourse(
+                organization=organization_obj,
+                course_id=course_id,
+                active=True,
+                created=now,
+                modified=now,
+            )
+        ],
+        **upsert_options,
+    )
+    if existing:
+        relationship = internal.OrganizationCourse(
+            id=existing['id'],
+            created=existing['created'],
+            modified=now,
             organization=organization_obj,
-            course_id=str(course_key),
-            active=True
+            course_id=course_id,
+            active=True,
         )
+    else:
+        # Not every database returns the ids of upserted rows, so read the row back.
+        # It was inserted by this call, rather than by a concurrent one, if it was created just now.
+        relationship = internal.OrganizationCourse.objects.get(organization=organization_obj, course_id=course_id)
+    internal.OrganizationCourse.history.bulk_history_create(  # pylint: disable=no-member
+        [relationship], update=relationship.created != now, default_date=now
+    )
+    # `bulk_create` does not send `post_save`.
+    caching.invalidate_course_organizations()
 
 
 def bulk_create_organization_courses(
@@ -392,13 +761,6 @@ def bulk_create_organization_courses(
         """
         return linkage.organization.short_name.lower(), linkage.course_id
 
-    # Grab all org-course linkages from db (whether active or inactive).
-    db_linkages = list(
-        internal.OrganizationCourse.objects.all().prefetch_related(
-            'organization'
-        )
-    )
-
     # For the organizations that have been requested for creation,
     # build a set of (lowered org shortname, course key string) linkage pairs.
     # This will remove any duplicates.
@@ -408,7 +770,23 @@ def bulk_create_organization_courses(
         in organization_course_pairs
     }
 
-    # Build the same set of pairs for linkages already in the db.
+    # Grab the requested org-course linkages that already exist in the db
+    # (whether active or inactive). We only load the linkages of the requested
+    # courses, a chunk of course ids at a time, so that the cost of this
+    # scales with the size of the request rather than the size of the table.
+    requested_course_ids = {course_id for _, course_id in requested_linkage_pairs}
+    db_linkages = [
+        linkage
+        for course_ids in _chunks(requested_course_ids)
+        for linkage in internal.OrganizationCourse.objects.filter(
+            course_id__in=course_ids
+        ).select_related(
+            'organization'
+        )
+        if linkage_to_pair(linkage) in requested_linkage_pairs
+    ]
+
+    # Build the same set of pairs for requested linkages already in the db.
     db_linkage_pairs = {
         linkage_to_pair(linkage) for linkage in db_linkages
     }
@@ -447,24 +825,25 @@ def bulk_create_organization_courses(
     if dry_run:
         return linkage_pairs_to_create, linkage_pairs_to_reactivate
 
-    # Bulk-reactivate existing organization-course linkages.
-    # If `ids_of_linkages_to_reactivate` is an empty set, then this is a no-op.
-    ids_of_linkages_to_reactivate = {linkage.id for linkage in linkages_to_reactivate}
-    internal.OrganizationCourse.objects.filter(
-        id__in=ids_of_linkages_to_reactivate
-    ).update(
-        active=True
-    )
+    # Bulk-reactivate existing organization-course linkages, a chunk of ids at a time.
+    # If `linkages_to_reactivate` is empty, then this is a no-op.
+    modified = timezone.now()
+    for linkages in _chunks(linkages_to_reactivate):
+        internal.OrganizationCourse.objects.filter(
+            id__in=[linkage.id for linkage in linkages]
+        ).update(
+            active=True,
+            modified=modified,
+        )
 
-    # Load up a dict: (org short names, Organization model instances).
+    # Load up a dict: (org short names, Organization model instances),
+    # a chunk of short names at a time.
     # We need these Organizations so we can create linkages against them in the
     # next step.
-    organizations_for_create = query_organizations_by_short_name(
-        org for org, _ in linkage_pairs_to_create
-    )
     organizations_for_create_by_short_name = {
         organization.short_name.lower(): organization
-        for organization in organizations_for_create
+        for short_names in _chunks({org for org, _ in linkage_pairs_to_create})
+        for organization in query_organizations_by_short_name(short_names)
     }
 
     # Bulk-create new organization-course linkages.
@@ -477,6 +856,8 @@ def bulk_create_organization_courses(
         for org_short_name, course_id
         in linkage_pairs_to_create
     ])
+    # Neither `update` nor `bulk_create` sends `post_save`.
+    caching.invalidate_course_organizations()
     return linkage_pairs_to_create, linkage_pairs_to_reactivate
 
 
@@ -521,6 +902,60 @@ def delete_organization_course(organization, course_key):
         pass
 
 
+def bulk_delete_organization_courses(organization_course_pairs, dry_run=False):
+    """
+    Efficiently deactivate multiple organization-course relationships in the database,
+    with chunked set-based updates, writing their history records in bulk.
+
+    Arguments:
+
+        organization_course_pairs (iterable[tuple[dict, CourseKey]]):
+            An iterable of (organization_data, course_key) pairs.
+            Linkages that do not exist or are already inactive are skipped.
+
+        dry_run (bool):
+            Optional, defaulting to False.
+            If True, don't apply changes, but still return organization-course
+            linkages that would have been deactivated.
+
+    Returns: set[tuple[str, str]]
+
+        The deactivated organization-course linkages, as
+        (lowercased organization short name, course key string) pairs,
+        like `bulk_create_organization_courses`.
+    """
+    requested_linkage_pairs = {
+        (organization_data["short_name"].lower(), str(course_key))
+        for organization_data, course_key
+        in organization_course_pairs
+    }
+    # Only load the active linkages of the requested courses, a chunk of course ids at a time.
+    requested_course_ids = {course_id for _, course_id in requested_linkage_pairs}
+    linkages_to_deactivate = [
+        linkage
+        for course_ids in _chunks(requested_course_ids)
+        for linkage in internal.OrganizationCourse.objects.filter(
+            course_id__in=course_ids,
+            active=True,
+        ).select_related(
+            'organization'
+        )
+        if (linkage.organization.short_name.lower(), linkage.course_id) in requested_linkage_pairs
+    ]
+    linkage_pairs_to_deactivate = {
+        (linkage.organization.short_name.lower(), linkage.course_id)
+        for linkage in linkages_to_deactivate
+    }
+    if dry_run:
+        return linkage_pairs_to_deactivate
+
+    for linkages in _chunks(linkages_to_deactivate):
+        _bulk_set_active(internal.OrganizationCourse, False, id__in=[linkage.id for linkage in linkages])
+    # `update` does not send `post_save`.
+    caching.invalidate_course_organizations()
+    return linkage_pairs_to_deactivate
+
+
 def fetch_organization_courses(organization):
     """
     Retrieves the set of courses currently linked to the specified organization
@@ -538,18 +973,68 @@ def fetch_course_organizations(course_key):
     """
     Retrieves the organizations linked to the specified course
     """
-    queryset = internal.OrganizationCourse.objects.filter(
-        course_id=str(course_key),
-        active=True
-    ).select_related('organization')
-    return [serializers.serialize_organization_with_course(organization) for organization in queryset]
+    course_id = str(course_key)
+    generation = caching.course_organizations_generation()
+    organizations = caching.get_cached_course_organizations(generation, course_id)
+    if organizations is None:
+        queryset = internal.OrganizationCourse.objects.filter(
+            course_id=course_id,
+            active=True
+        ).select_related('organization').order_by('id')
+        organizations = [serializers.serialize_organization_with_course(organization) for organization in queryset]
+        caching.cache_course_organizations(generation, course_id, organizations)
+    return organizations
+
+
+def fetch_organizations_for_courses(course_keys):
+    """
+    Retrieves the organizations linked to each of the specified courses
+    Returns a dict mapping each given course key to its list of organizations
+    """
+    course_ids_by_key = {course_key: str(course_key) for course_key in course_keys}
+    generation = caching.course_organizations_generation()
+    organizations_by_course_id = caching.get_many_cached_course_organizations(
+        generation, set(course_ids_by_key.values())
+    )
+    missing_course_ids = set(course_ids_by_key.values()) - set(organizations_by_course_id)
+    for course_ids in _chunks(missing_course_ids):
+        fetched_organizations_by_course_id = {course_id: [] for course_id in course_ids}
+        queryset = internal.OrganizationCourse.objects.filter(
+            course_id__in=course_ids,
+            active=True
+        ).select_related('organization').order_by('id')
+        for organization_course in queryset:
+            fetched_organizations_by_course_id[organization_course.course_id].append(
+                serializers.serialize_organization_with_course(organization_course)
+            )
+        caching.cache_many_course_organizations(generation, fetched_organizations_by_course_id)
+        organizations_by_course_id.update(fetched_organizations_by_course_id)
+    return {
+        course_key: organizations_by_course_id[course_id]
+        for course_key, course_id in course_ids_by_key.items()
+    }
 
 
 def delete_course_references(course_key):
     """
     Inactivates references to course keys within this app (ref: receivers.py and api.py)
     """
-    [_inactivate_record(record) for record in internal.OrganizationCourse.objects.filter(
-        course_id=str(course_key),
-        active=True
-    )]
+    bulk_delete_course_references([course_key])
+
+
+def bulk_delete_course_references(course_keys):
+    """
+    Inactivates references to many course keys within this app
+    Returns a dict mapping each course key to the number of references inactivated
+    """
+    course_ids_by_key = {course_key: str(course_key) for course_key in course_keys}
+    relationships = []
+    for course_ids in _chunks(set(course_ids_by_key.values())):
+        relationships += _bulk_set_active(internal.OrganizationCourse, False, course_id__in=course_ids)
+    if relationships:
+        caching.invalidate_course_organizations()
+    counts_by_course_id = Counter(relationship.course_id for relationship in relationships)
+    return {
+        course_key: counts_by_course_id[course_id]
+        for course_key, course_id in course_ids_by_key.items()
+    }
@@ -0,0 +1,313 @@
+"""
+Opt-in instrumentation of the calls to api.py.
+
+When the ``ORGANIZATIONS_INSTRUMENTATION_ENABLED`` setting is on (off by
+default), every call to a public function of api.py is measured: its wall
+time, the number of SQL queries it ran, and the time spent in them. Calls
+made by other API functions are counted as part of the outermost call.
+
+Each measurement is handed to the sinks named in the
+``ORGANIZATIONS_INSTRUMENTATION_SINKS`` setting, a list of dotted paths of
+`Sink` subclasses (by default, `LoggingSink` and `InMemorySink`). Sinks are
+instantiated once per process; use `get_sinks` to reach them, e.g. to read
+the per-function percentiles aggregated by `InMemorySink`.
+
+Independently, when the ``ORGANIZATIONS_SLOW_CALL_THRESHOLD`` setting is a
+number of seconds (it is None by default), every API call and v0 API request
+which takes at least that long is logged as a warning, with its arguments, the
+SQL statements it ran and their timings, and on SQLite, the query plan of the
+slowest statement.
+"""
+import logging
+import math
+import reprlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.utils.module_loading import import_string
+
+
+log = logging.getLogger(__name__)
+
+DEFAULT_SINKS = (
+    'organizations.instrumentation.LoggingSink',
+    'organizations.instrumentation.InMemorySink',
+)
+DEFAULT_MAX_SAMPLES = 1000
+MAX_SLOW_CALL_STATEMENTS = 100
+MAX_STATEMENT_LENGTH = 1000
+
+_state = threading.local()
+
+_argument_repr = reprlib.Repr()
+_argument_repr.maxstring = 200
+_argument_repr.maxother = 200
+
+
+class CallRecord(NamedTuple):
+    """
+    The measurement of a call to an API function.
+    """
+    function: str
+    duration: float
+    query_count: int
+    query_duration: float
+    succeeded: bool
+
+
+class Sink(ABC):
+    """
+    Base class of the destinations of call records.
+    """
+
+    @abstractmethod
+    def record(self, call):
+        """
+        Handle a `CallRecord`.
+        """
+
+
+class LoggingSink(Sink):
+    """
+    Logs every call record at the DEBUG level.
+    """
+
+    def record(self, call):
+        log.debug(
+            "%s took %.2f ms and ran %d queries in %.2f ms%s.",
+            call.function,
+            call.duration * 1000,
+            call.query_count,
+            call.query_duration * 1000,
+            "" if call.succeeded else " before failing",
+        )
+
+
+def _percentile(sorted_values, percent):
+    """
+    Return the nearest-rank percentile of a non-empty sorted list.
+    """
+    rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class InMemorySink(Sink):
+    """
+    Keeps the latest ``ORGANIZATIONS_INSTRUMENTATION_MAX_SAMPLES`` call records
+    of each function, to summarize them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = defaultdict(self._new_samples)
+        self._call_counts = defaultdict(int)
+
+    @staticmethod
+    def _new_samples():
+        return deque(maxlen=getattr(settings, 'ORGANIZATIONS_INSTRUMENTATION_MAX_SAMPLES', DEFAULT_MAX_SAMPLES))
+
+    def record(self, call):
+        with self._lock:
+            self._calls[call.function].append(call)
+            self._call_counts[call.function] += 1
+
+    def summary(self):
+        """
+        Return a dict mapping each function's name to statistics of its calls.
+
+        The call count covers every call, the other statistics only the kept samples.
+        """
+        with self._lock:
+            calls_by_function = {function: list(calls) for function, calls in self._calls.items()}
+            call_counts = dict(self._call_counts)
+        summary = {}
+        for function, calls in calls_by_function.items():
+            durations = sorted(call.duration * 1000 for call in calls)
+            query_counts = [call.query_count for call in calls]
+            summary[function] = {
+                'calls': call_counts[function],
+                'p50_ms': _percentile(durations, 50),
+                'p99_ms': _percentile(durations, 99),
+                'queries_per_call': sum(query_counts) / len(calls),
+                'max_queries': max(query_counts),
+                'query_ms_per_call': sum(call.query_duration for call in calls) * 1000 / len(calls),
+            }
+        return summary
+
+    def reset(self):
+        """
+        Forget every call record.
+        """
+        with self._lock:
+            self._calls.clear()
+            self._call_counts.clear()
+
+
+@lru_cache(maxsize=None)
+def _load_sinks(sink_paths):
+    """
+    Instantiate the sinks with the given dotted paths, once per process.
+    """
+    return tuple(import_string(sink_path)() for sink_path in sink_paths)
+
+
+def get_sinks():
+    """
+    Return the configured sinks.
+    """
+    return _load_sinks(tuple(getattr(settings, 'ORGANIZATIONS_INSTRUMENTATION_SINKS', DEFAULT_SINKS)))
+
+
+def instrumentation_enabled():
+    """
+    Return whether calls to API functions are measured.
+    """
+    return bool(getattr(settings, 'ORGANIZATIONS_INSTRUMENTATION_ENABLED', False))
+
+
+def slow_call_threshold():
+    """
+    Return the duration in seconds from which calls are logged as slow, or None.
+    """
+    return getattr(settings, 'ORGANIZATIONS_SLOW_CALL_THRESHOLD', None)
+
+
+class _Statement(NamedTuple):
+    """
+    An SQL statement run during a call.
+    """
+    sql: str
+    params: object
+    many: bool
+    duration: float
+
+
+class _QueryRecorder:
+    """
+    A database execute wrapper which counts and times queries, and keeps the
+    first statements if `capture` is set.
+    """
+
+    def __init__(self, capture=False):
+        self.capture = capture
+        self.query_count = 0
+        self.query_duration = 0.0
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.query_count += 1
+            self.query_duration += duration
+            if self.capture and len(self.statements) < MAX_SLOW_CALL_STATEMENTS:
+                self.statements.append(_Statement(sql, params, many, duration))
+
+
+def _emit(call):
+    """
+    Hand a call record to every sink, never letting a failing sink break the call.
+    """
+    for sink in get_sinks():
+        try:
+            sink.record(call)
+        except Exception:
+            log.exception("Instrumentation sink %r failed to record a call to %s.", sink, call.function)
+
+
+def _explain(statement):
+    """
+    Return the SQLite query plan of a statement, or None if it cannot be explained.
+    """
+    if connection.vendor != 'sqlite' or statement.many:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {statement.sql}', statement.params)
+            return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+    except DatabaseError:
+        return None
+
+
+def _log_slow_call(call, args, kwargs, recorder):
+    """
+    Log a slow call, with its (truncated) arguments and the statements it ran.
+    """
+    arguments = ', '.join(
+        [_argument_repr.repr(arg) for arg in args]
+        + [f'{name}={_argument_repr.repr(value)}' for name, value in kwargs.items()]
+    )
+    lines = [
+        f'{statement.duration * 1000:.2f} ms: {statement.sql[:MAX_STATEMENT_LENGTH]} '
+        f'{_argument_repr.repr(statement.params)}'
+        for statement in recorder.statements
+    ]
+    if recorder.query_count > len(recorder.statements):
+        lines.append(f'... and {recorder.query_count - len(recorder.statements)} more statements')
+    if recorder.statements:
+        query_plan = _explain(max(recorder.statements, key=lambda statement: statement.duration))
+        if query_plan:
+            lines.append(f'Query plan of the slowest statement:\n{query_plan}')
+    log.warning(
+        "Slow call to %s(%s) took %.2f ms and ran %d queries in %.2f ms:\n%s",
+        call.function,
+        arguments,
+        call.duration * 1000,
+        call.query_count,
+        call.query_duration * 1000,
+        '\n'.join(lines),
+    )
+
+
+@contextmanager
+def measure(function_name, args=(), kwargs=None):
+    """
+    Measure the code run in this context as a call to `function_name` with the
+    given arguments, if instrumentation or the slow call log is enabled.
+
+    Calls measured within another call are counted as part of it.
+    """
+    threshold = slow_call_threshold()
+    enabled = instrumentation_enabled()
+    if getattr(_state, 'active', False) or not (enabled or threshold is not None):
+        yield
+        return
+    recorder = _QueryRecorder(capture=threshold is not None)
+    succeeded = False
+    _state.active = True
+    start = time.perf_counter()
+    try:
+        with connection.execute_wrapper(recorder):
+            yield
+        succeeded = True
+    finally:
+        duration = time.perf_counter() - start
+        _state.active = False
+        call = CallRecord(function_name, duration, recorder.query_count, recorder.query_duration, succeeded)
+        if enabled:
+            _emit(call)
+        if threshold is not None and duration >= threshold:
+            _log_slow_call(call, args, kwargs or {}, recorder)
+
+
+def instrument(function):
+    """
+    Decorate an API function so that its calls are measured (see `measure`).
+    """
+    function_name = f'{function.__module__}.{function.__qualname__}'
+
+    @wraps(function)
+    def instrumented(*args, **kwargs):
+        with measure(function_name, args, kwargs):
+            return function(*args, **kwargs)
+
+    return instrumented
@@ -0,0 +1,256 @@
+"""
+Ingestion of organization logos from remote URLs, off the request thread.
+
+When an organization is created or updated with a `logo_url` (see
+serializers.py), we record a pending `OrganizationLogoFetch` and, once the
+transaction commits, hand the download over to a logo fetcher. The fetcher
+is chosen by the ``ORGANIZATIONS_LOGO_FETCHER`` setting, the dotted path of a
+`LogoFetcher` subclass. By default, `ThreadPoolLogoFetcher` downloads logos
+in a bounded pool of threads in the current process; deployments may plug in
+a fetcher which submits `fetch_logo` to a task queue instead.
+
+Downloaded logos are stored under the SHA-256 hash of their content, so that
+fetching an unchanged logo again writes nothing, and organizations with the
+same logo share a single stored file.
+
+Downloads are governed by the following settings:
+
+* ``ORGANIZATIONS_LOGO_FETCH_TIMEOUT``: seconds to wait for the remote server (default: 10).
+* ``ORGANIZATIONS_LOGO_FETCH_RETRIES``: retries after a failed attempt (default: 2).
+* ``ORGANIZATIONS_LOGO_FETCH_RETRY_DELAY``: seconds before the first retry,
+  doubled before each further one (default: 1).
+* ``ORGANIZATIONS_LOGO_FETCH_MAX_WORKERS``: size of the default thread pool (default: 4).
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from organizations.models import Organization, OrganizationLogoFetch
+
+
+log = logging.getLogger(__name__)
+
+DEFAULT_LOGO_FETCHER = 'organizations.logos.ThreadPoolLogoFetcher'
+DEFAULT_TIMEOUT = 10
+DEFAULT_RETRIES = 2
+DEFAULT_RETRY_DELAY = 1
+DEFAULT_MAX_WORKERS = 4
+
+
+class LogoFetcher(ABC):
+    """
+    Base class of logo fetchers, which run `fetch_logo` for submitted logos.
+    """
+
+    @abstractmethod
+    def submit(self, organization_id, logo_url):
+        """
+        Arrange for `fetch_logo(organization_id, logo_url)` to run.
+        """
+
+
+class SynchronousLogoFetcher(LogoFetcher):
+    """
+    Fetches logos immediately, in the calling thread.
+    """
+
+    def submit(self, organization_id, logo_url):
+        fetch_logo(organization_id, logo_url)
+
+
+class ThreadPoolLogoFetcher(LogoFetcher):
+    """
+    Fetches logos in a process-wide pool of at most
+    ``ORGANIZATIONS_LOGO_FETCH_MAX_WORKERS`` threads.
+    """
+    _executor = None
+    _executor_lock = threading.Lock()
+
+    @classmethod
+    def _get_executor(cls):
+        """
+        Return the shared executor, creating it on first use.
+        """
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'ORGANIZATIONS_LOGO_FETCH_MAX_WORKERS', DEFAULT_MAX_WORKERS),
+                    thread_name_prefix='organization-logos',
+                )
+            return cls._executor
+
+    def submit(self, organization_id, logo_url):
+        return self._get_executor().submit(self._fetch_logo, organization_id, logo_url)
+
+    @staticmethod
+    def _fetch_logo(organization_id, logo_url):
+        """
+        Run `fetch_logo` in a worker thread, which owns its database connections.
+        """
+        try:
+            fetch_logo(organization_id, logo_url)
+        except Exception:
+            log.exception("Unexpected error fetching logo %s of organization %s.", logo_url, organization_id)
+        finally:
+            close_old_connections()
+
+
+def get_logo_fetcher():
+    """
+    Return an instance of the configured logo fetcher.
+    """
+    return import_string(getattr(settings, 'ORGANIZATIONS_LOGO_FETCHER', DEFAULT_LOGO_FETCHER))()
+
+
+def schedule_logo_fetch(organization, logo_url):
+    """
+    Record that `organization`'s logo should be fetched from `logo_url`, and
+    submit the download once the current transaction commits.
+
+    The validators of the previous download are kept if it was from the same
+    URL, so that the download can be skipped if the logo has not changed.
+    """
+    logo_fetch, _ = OrganizationLogoFetch.objects.get_or_create(
+        organization=organization, defaults={'source_url': logo_url},
+    )
+    if logo_fetch.source_url != logo_url:
+        logo_fetch.source_url = logo_url
+        logo_fetch.etag = ''
+        logo_fetch.last_modified = ''
+    logo_fetch.status = OrganizationLogoFetch.PENDING
+    logo_fetch.attempts = 0
+    logo_fetch.error = ''
+    logo_fetch.save()
+    organization_id = organization.id
+    transaction.on_commit(lambda: get_logo_fetcher().submit(organization_id, logo_url))
+
+
+def content_addressed_logo_name(logo_url, content):
+    """
+    Return the file name under which to store a logo: the hex SHA-256 digest
+    of its content, followed by the extension of the URL's path, if any.
+    """
+    extension = os.path.splitext(urlparse(logo_url).path)[1].lower()
+    if not re.match(r'^\.[a-z0-9]{1,10}$', extension):
+        extension = ''
+    return hashlib.sha256(content).hexdigest() + extension
+
+
+def store_logo(organization_id, logo_url, content):
+    """
+    Make `content` the logo of the organization with id `organization_id`,
+    writing it to storage only if no identical logo is stored yet.
+
+    Only the logo (and the modification time) of the organization is saved,
+    on a copy loaded at this point, so that changes made to the organization
+    during the download are kept.
+
+    Returns whether the organization's logo changed.
+    """
+    organization = Organization.objects.get(id=organization_id)
+    name = organization.logo.field.generate_filename(
+        organization, content_addressed_logo_name(logo_url, content)
+    )
+    if organization.logo.name == name:
+        return False
+    storage = organization.logo.storage
+    if not storage.exists(name):
+        name = storage.save(name, ContentFile(content))
+    organization.logo = name
+    organization.save(update_fields=['logo', 'modified'])
+    return True
+
+
+def _download(logo_url, headers):
+    """
+    Download a logo, retrying on network errors and server errors.
+
+    Returns a tuple of (response or None, number of attempts, error message).
+    """
+    retries = getattr(settings, 'ORGANIZATIONS_LOGO_FETCH_RETRIES', DEFAULT_RETRIES)
+    retry_delay = getattr(settings, 'ORGANIZATIONS_LOGO_FETCH_RETRY_DELAY', DEFAULT_RETRY_DELAY)
+    timeout = getattr(settings, 'ORGANIZATIONS_LOGO_FETCH_TIMEOUT', DEFAULT_TIMEOUT)
+    error = ''
+    for attempt in range(1, retries + 2):
+        if attempt > 1:
+            time.sleep(retry_delay * 2 ** (attempt - 2))
+        try:
+            response = requests.get(logo_url, headers=headers, timeout=timeout)
+        except requests.RequestException as exception:
+            error = f"{exception.__class__.__name__}: {exception}"
+            continue
+        if response.status_code < 400:
+            return response, attempt, ''
+        error = f"HTTP {response.status_code}"
+        if response.status_code < 500:
+            # Client errors won't go away by retrying.
+            break
+    return None, attempt, error
+
+
+def fetch_logo(organization_id, logo_url):
+    """
+    Download an organization's logo from `logo_url`, store it, and record the outcome.
+
+    Does nothing if the organization's logo has since been requested from
+    another URL, as a newer download will take care of it. Failures to store
+    the downloaded logo are recorded like failed downloads. If the logo was
+    already downloaded from this URL, the request is conditional, and
+    nothing is downloaded or stored if the server answers 304 Not Modified.
+    Recording the outcome touches the fetch's `modified` time, which the
+    validators of the v0 API cover.
+    """
+    fetch_filter = {'organization_id': organization_id, 'source_url': logo_url}
+    logo_fetch = OrganizationLogoFetch.objects.filter(**fetch_filter).select_related('organization').first()
+    if logo_fetch is None:
+        log.info("Skipping superseded logo %s of organization %s.", logo_url, organization_id)
+        return
+
+    headers = {}
+    if logo_fetch.organization.logo:
+        if logo_fetch.etag:
+            headers['If-None-Match'] = logo_fetch.etag
+        if logo_fetch.last_modified:
+            headers['If-Modified-Since'] = logo_fetch.last_modified
+
+    response, attempts, error = _download(logo_url, headers)
+    if response is None:
+        log.warning("Failed to fetch logo %s of organization %s: %s", logo_url, organization_id, error)
+        OrganizationLogoFetch.objects.filter(**fetch_filter).update(
+            status=OrganizationLogoFetch.FAILED, attempts=attempts, error=error, modified=timezone.now(),
+        )
+        return
+
+    validators = {}
+    if response.status_code != 304:
+        try:
+            store_logo(organization_id, logo_url, response.content)
+        except Exception as exception:
+            log.exception("Failed to store logo %s of organization %s.", logo_url, organization_id)
+            OrganizationLogoFetch.objects.filter(**fetch_filter).update(
+                status=OrganizationLogoFetch.FAILED,
+                attempts=attempts,
+                error=f"{exception.__class__.__name__}: {exception}",
+                modified=timezone.now(),
+            )
+            return
+        validators = {
+            'etag': response.headers.get('ETag', '')[:255],
+            'last_modified': response.headers.get('Last-Modified', '')[:64],
+        }
+    OrganizationLogoFetch.objects.filter(**fetch_filter).update(
+        status=OrganizationLogoFetch.SUCCEEDED, attempts=attempts, error='', modified=timezone.now(), **validators,
+    )
@@ -0,0 +1,142 @@
+"""
+Import organizations in bulk from a CSV or JSON Lines file through manage.py.
+"""
+import csv
+import json
+import logging
+import os
+import time
+
+from django.core.management import BaseCommand, CommandError
+
+from organizations import api
+from organizations import exceptions
+
+
+logger = logging.getLogger(__name__)
+
+ORGANIZATION_FIELDS = ('short_name', 'name', 'description', 'logo')
+
+
+def _organization_data(row):
+    """
+    Keep the organization fields of a row, dropping other and empty values.
+    """
+    return {
+        field: row[field] for field in ORGANIZATION_FIELDS
+        if row.get(field) not in (None, '')
+    }
+
+
+def _read_csv(lines):
+    """
+    Yield organization dictionaries from CSV lines with a header row.
+    """
+    for row in csv.DictReader(lines):
+        yield _organization_data(row)
+
+
+def _read_jsonl(lines):
+    """
+    Yield organization dictionaries from JSON Lines, skipping blank lines.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            raise CommandError(f"Invalid JSON on line {line_number}: {error}") from error
+        if not isinstance(row, dict):
+            raise CommandError(f"Expected a JSON object on line {line_number}.")
+        yield _organization_data(row)
+
+
+READERS = {
+    'csv': _read_csv,
+    'jsonl': _read_jsonl,
+}
+
+
+class Command(BaseCommand):
+    """Management command used to import many organizations at once.
+
+    The file is either CSV with a header row, or JSON Lines (one JSON object per
+    line). Each row must have a `short_name` and a `name`, and may have a
+    `description` and a `logo`; other columns are ignored. The file is streamed
+    through `api.bulk_add_organizations` in batches, so it may be arbitrarily large.
+
+    Example: ./manage.py bulk_import_organizations partners.csv --batch-size 5000
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('file_path')
+        parser.add_argument(
+            '--format',
+            choices=sorted(READERS),
+            help="Format of the file. By default, guessed from its extension.",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Number of rows to store at a time.",
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Report what would be created or reactivated, without changing anything.",
+        )
+        parser.add_argument(
+            '--no-activate',
+            action='store_true',
+            help="Create missing organizations as inactive, and leave inactive ones inactive.",
+        )
+
+    def handle(self, *args, **options):
+        file_path = options['file_path']
+        file_format = options['format'] or os.path.splitext(file_path)[1].lstrip('.').lower()
+        if file_format not in READERS:
+            raise CommandError(
+                f"Cannot guess the format of {file_path}; please specify --format."
+            )
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be a positive number.")
+
+        processed_counts = [0]
+
+        def report_progress(processed_count, created_count, reactivated_count):
+            processed_counts[0] = processed_count
+            logger.info(
+                "Processed %d rows: %d organizations created, %d reactivated.",
+                processed_count, created_count, reactivated_count,
+            )
+
+        start_time = time.monotonic()
+        try:
+            with open(file_path, newline='', encoding='utf-8') as lines:
+                created_count, reactivated_count = api.bulk_add_organizations(
+                    READERS[file_format](lines),
+                    dry_run=options['dry_run'],
+                    activate=not options['no_activate'],
+                    batch_size=options['batch_size'],
+                    progress_callback=report_progress,
+                    counts_only=True,
+                )
+        except OSError as error:
+            raise CommandError(f"Cannot read {file_path}: {error}") from error
+        except exceptions.InvalidOrganizationException as error:
+            raise CommandError(f"Invalid organization in {file_path}: {error}") from error
+        elapsed = time.monotonic() - start_time
+
+        logger.info(
+            "%sImported %d rows from %s in %.2f seconds (%.0f rows/second): "
+            "%d organizations created, %d reactivated.",
+            "[DRY RUN] " if options['dry_run'] else "",
+            processed_counts[0],
+            file_path,
+            elapsed,
+            processed_counts[0] / elapsed if elapsed else 0,
+            created_count,
+            reactivated_count,
+        )
@@ -0,0 +1,134 @@
+"""
+Tests for the organization bulk-import management command.
+"""
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+
+from organizations.models import Organization
+
+LOGGER_NAME = 'organizations.management.commands.bulk_import_organizations'
+
+
+class TestBulkImportOrganizationsCommand(TestCase):
+    """ Tests for bulk_import_organizations.Command. """
+
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+    def write_file(self, file_name, content):
+        """
+        Write `content` to a file in the temporary directory and return its path.
+        """
+        file_path = os.path.join(self.temp_dir, file_name)
+        with open(file_path, 'w', encoding='utf-8') as output:
+            output.write(content)
+        return file_path
+
+    def write_jsonl(self, rows, file_name='orgs.jsonl'):
+        """
+        Write `rows` as JSON Lines and return the file's path.
+        """
+        return self.write_file(file_name, ''.join(json.dumps(row) + '\n' for row in rows))
+
+    def test_import_csv(self):
+        file_path = self.write_file('orgs.csv', (
+            "short_name,name,description,country\n"
+            "org_a,Org A,First org,FR\n"
+            "org_b,Org B,,US\n"
+            "ORG_A,Duplicate of Org A,,FR\n"
+            "org_c,Org C,Third org,\n"
+        ))
+        with self.assertLogs(LOGGER_NAME, level='INFO') as logs:
+            call_command('bulk_import_organizations', file_path, '--batch-size', '2')
+
+        assert {
+            (org.short_name, org.name, org.description, org.active)
+            for org in Organization.objects.all()
+        } == {
+            ('org_a', 'Org A', 'First org', True),
+            ('org_b', 'Org B', '', True),
+            ('org_c', 'Org C', 'Third org', True),
+        }
+        # One message per batch, then the summary.
+        assert len(logs.output) == 3
+        assert "Imported 4 rows" in logs.output[-1]
+        assert "rows/second" in logs.output[-1]
+        assert "3 organizations created, 0 reactivated" in logs.output[-1]
+
+    def test_import_jsonl(self):
+        Organization.objects.create(short_name='org_a', name='Org A', active=False)
+        file_path = self.write_jsonl([
+            {'short_name': 'org_a', 'name': 'Org A'},
+            {'short_name': 'org_b', 'name': 'Org B', 'extra': 'ignored'},
+        ])
+        with self.assertLogs(LOGGER_NAME, level='INFO') as logs:
+            call_command('bulk_import_organizations', file_path)
+        assert set(Organization.objects.filter(active=True).values_list('short_name', flat=True)) == {
+            'org_a', 'org_b'
+        }
+        assert "1 organizations created, 1 reactivated" in logs.output[-1]
+
+    def test_dry_run(self):
+        file_path = self.write_jsonl([{'short_name': 'org_a', 'name': 'Org A'}], file_name='orgs.data')
+        with self.assertLogs(LOGGER_NAME, level='INFO') as logs:
+            call_command('bulk_import_organizations', file_path, '--format', 'jsonl', '--dry-run')
+        assert not Organization.objects.exists()
+        assert "[DRY RUN] Imported 1 rows" in logs.output[-1]
+        assert "1 organizations created" in logs.output[-1]
+
+    def test_no_activate(self):
+        Organization.objects.create(short_name='org_a', name='Org A', active=False)
+        file_path = self.write_jsonl([
+            {'short_name': 'org_a', 'name': 'Org A'},
+            {'short_name': 'org_b', 'name': 'Org B'},
+        ])
+        call_command('bulk_import_organizations', file_path, '--no-activate')
+        assert not Organization.objects.filter(active=True).exists()
+        assert Organization.objects.count() == 2
+
+    def test_empty_file(self):
+        file_path = self.write_file('orgs.jsonl', '\n')
+        with self.assertLogs(LOGGER_NAME, level='INFO') as logs:
+            call_command('bulk_import_organizations', file_path)
+        assert "Imported 0 rows" in logs.output[-1]
+
+    def test_unknown_format(self):
+        file_path = self.write_file('orgs.txt', '')
+        with self.assertRaisesRegex(CommandError, 'specify --format'):
+            call_command('bulk_import_organizations', file_path)
+
+    def test_bad_batch_size(self):
+        file_path = self.write_file('orgs.csv', '')
+        with self.assertRaisesRegex(CommandError, 'batch-size'):
+            call_command('bulk_import_organizations', file_path, '--batch-size', '0')
+
+    def test_missing_file(self):
+        with self.assertRaisesRegex(CommandError, 'Cannot read'):
+            call_command('bulk_import_organizations', os.path.join(self.temp_dir, 'missing.csv'))
+
+    def test_invalid_json(self):
+        file_path = self.write_file('orgs.jsonl', '{"short_name": "org_a", "name": "Org A"}\n{oops\n')
+        with self.assertRaisesRegex(CommandError, 'line 2'):
+            call_command('bulk_import_organizations', file_path)
+
+    def test_json_not_an_object(self):
+        file_path = self.write_file('orgs.jsonl', '["org_a"]\n')
+        with self.assertRaisesRegex(CommandError, 'line 1'):
+            call_command('bulk_import_organizations', file_path)
+
+    def test_invalid_organization(self):
+        file_path = self.write_jsonl([
+            {'short_name': 'org_a', 'name': 'Org A'},
+            {'name': 'Org without short name'},
+        ])
+        with self.assertRaisesRegex(CommandError, 'Invalid organization'):
+            call_command('bulk_import_organizations', file_path, '--batch-size', '1')
+        # The batch before the invalid row was stored.
+        assert Organization.objects.filter(short_name='org_a').exists()
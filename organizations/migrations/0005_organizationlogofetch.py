@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0004_auto_20230727_2054'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganizationLogoFetch',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('source_url', models.CharField(max_length=2048, verbose_name='Source URL')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='pending', max_length=16)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('organization', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='logo_fetch', to='organizations.organization')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0005_organizationlogofetch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organizationlogofetch',
+            name='etag',
+            field=models.CharField(blank=True, default='', max_length=255, verbose_name='ETag'),
+        ),
+        migrations.AddField(
+            model_name='organizationlogofetch',
+            name='last_modified',
+            field=models.CharField(blank=True, default='', max_length=64, verbose_name='Last-Modified'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0006_organizationlogofetch_validators'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='organizationcourse',
+            index=models.Index(fields=['course_id', 'active'], name='orgcourse_course_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organizationcourse',
+            index=models.Index(fields=['organization', 'active'], name='orgcourse_org_active_idx'),
+        ),
+        # Drop the foreign key's own index only once orgcourse_org_active_idx
+        # exists to back the constraint, as MySQL requires.
+        migrations.AlterField(
+            model_name='organizationcourse',
+            name='organization',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='organizations.organization'),
+        ),
+    ]
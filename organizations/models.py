@@ -7,6 +7,7 @@ offers one programmatic API -- api.py for direct Python integration.
 import re
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
 from model_utils.models import TimeStampedModel
 from simple_history.models import HistoricalRecords
@@ -41,6 +42,13 @@ class Organization(TimeStampedModel):
 
     history = HistoricalRecords()
 
+    class Meta:
+        """ Meta class for this Django model """
+        indexes = [
+            # Serves the case-insensitive lookups of data.query_organizations_by_short_name.
+            models.Index(Lower('short_name'), name='organization_short_name_ci_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.short_name})"
 
@@ -61,7 +69,8 @@ class OrganizationCourse(TimeStampedModel):
     .. no_pii:
     """
     course_id = models.CharField(max_length=255, db_index=True, verbose_name='Course ID')
-    organization = models.ForeignKey(Organization, db_index=True, on_delete=models.CASCADE)
+    # Indexed by orgcourse_org_active_idx, see Meta.indexes.
+    organization = models.ForeignKey(Organization, db_index=False, on_delete=models.CASCADE)
     active = models.BooleanField(default=True)
 
     history = HistoricalRecords()
@@ -69,5 +78,40 @@ class OrganizationCourse(TimeStampedModel):
     class Meta:
         """ Meta class for this Django model """
         unique_together = (('course_id', 'organization'),)
+        # Lookups of linkages by course or by organization almost always filter on `active` too.
+        indexes = [
+            models.Index(fields=['course_id', 'active'], name='orgcourse_course_active_idx'),
+            models.Index(fields=['organization', 'active'], name='orgcourse_org_active_idx'),
+        ]
         verbose_name = _('Link Course')
         verbose_name_plural = _('Link Courses')
+
+
+class OrganizationLogoFetch(TimeStampedModel):
+    """
+    The state of the latest download of an Organization's logo from a remote
+    URL (see logos.py), so that callers can tell when the logo is available.
+    The ETag and Last-Modified headers of the last successful download are
+    kept to revalidate the logo when it is requested from the same URL again.
+
+    .. no_pii:
+    """
+    PENDING = 'pending'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, _('Pending')),
+        (SUCCEEDED, _('Succeeded')),
+        (FAILED, _('Failed')),
+    )
+
+    organization = models.OneToOneField(Organization, related_name='logo_fetch', on_delete=models.CASCADE)
+    source_url = models.CharField(max_length=2048, verbose_name='Source URL')
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    etag = models.CharField(max_length=255, blank=True, default='', verbose_name='ETag')
+    last_modified = models.CharField(max_length=64, blank=True, default='', verbose_name='Last-Modified')
+
+    def __str__(self):
+        return f"{self.organization.short_name}: {self.source_url} ({self.status})"
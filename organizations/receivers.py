@@ -0,0 +1,33 @@
+"""
+Signal receivers for the organizations app.
+
+These keep the data layer's caches coherent with writes that go through
+model `save()`/`delete()`. Bulk writes (`update`, `bulk_create`) do not send
+these signals, so the code issuing them invalidates the caches explicitly.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from organizations import caching
+from organizations.models import Organization, OrganizationCourse
+
+
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+def invalidate_organization_cache(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drop cached organization lookups whenever an organization changes.
+    """
+    caching.clear_organization_cache()
+
+
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+@receiver(post_save, sender=OrganizationCourse)
+@receiver(post_delete, sender=OrganizationCourse)
+def invalidate_course_organizations_cache(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate cached course-organization lookups whenever a linkage, or an
+    organization embedded in the cached results, changes.
+    """
+    caching.invalidate_course_organizations()
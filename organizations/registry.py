@@ -0,0 +1,189 @@
+"""
+An optional, process-local snapshot of every active organization.
+
+Organizations are few and change rarely, so when the
+``ORGANIZATIONS_REGISTRY_ENABLED`` setting is on (off by default), data.py
+serves lookups of organizations by id and short name, and listings of
+organizations, from an in-memory snapshot rather than the database.
+
+The snapshot is rebuilt when the version stamp of the organization table (its
+row count and latest `modified` time) changes. The stamp is checked at most
+every ``ORGANIZATIONS_REGISTRY_CHECK_INTERVAL`` seconds (default: 60), and on
+the next read after this process writes organizations (see
+`caching.clear_organization_cache`). Writes made by other processes therefore
+become visible within that interval. A transaction which has written
+organizations reads them from the database until it commits, so that no
+snapshot is built from uncommitted rows.
+
+Lookups by short name compare short names like the database does: on MySQL,
+whose default collations are case-insensitive, exact lookups ignore case too.
+"""
+import threading
+import time
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Max
+
+from organizations import caching
+from organizations.models import Organization
+
+
+DEFAULT_CHECK_INTERVAL = 60
+# Database vendors whose (default) collations compare short names case-insensitively.
+CASE_INSENSITIVE_VENDORS = ('mysql',)
+
+
+class OrganizationRecord(NamedTuple):
+    """
+    An immutable record of an active organization.
+    """
+    id: int
+    name: str
+    short_name: str
+    description: str
+    logo: object
+
+    def to_dict(self):
+        """
+        Return the organization as a dict, like `serializers.serialize_organization`.
+        """
+        return self._asdict()
+
+
+class _Snapshot(NamedTuple):
+    """
+    The active organizations at a given version stamp of the organization table.
+    """
+    stamp: tuple
+    records: tuple
+    records_by_id: dict
+    records_by_lowered_short_name: dict
+
+
+class OrganizationRegistry:
+    """
+    A thread-safe, self-refreshing snapshot of the active organizations.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._checked_at = None
+        self._checked_generation = None
+
+    @staticmethod
+    def _version_stamp():
+        """
+        Return a value which changes whenever organizations are added, changed or deleted.
+
+        Every write to organizations updates their `modified` time, deletions
+        lower the row count.
+        """
+        stamp = Organization.objects.aggregate(count=Count('id'), modified=Max('modified'))
+        return stamp['count'], stamp['modified']
+
+    @staticmethod
+    def _build_snapshot(stamp):
+        """
+        Load the active organizations into a new snapshot.
+        """
+        records = tuple(
+            OrganizationRecord(
+                id=organization.id,
+                name=organization.name,
+                short_name=organization.short_name,
+                description=organization.description,
+                logo=organization.logo,
+            )
+            for organization in Organization.objects.filter(active=True).order_by('id')
+        )
+        records_by_lowered_short_name = {}
+        for record in records:
+            records_by_lowered_short_name.setdefault(record.short_name.lower(), []).append(record)
+        return _Snapshot(
+            stamp=stamp,
+            records=records,
+            records_by_id={record.id: record for record in records},
+            records_by_lowered_short_name={
+                short_name: tuple(matches) for short_name, matches in records_by_lowered_short_name.items()
+            },
+        )
+
+    def _current_snapshot(self):
+        """
+        Return the snapshot, after rebuilding it if it may be stale and the version stamp changed.
+        """
+        check_interval = getattr(settings, 'ORGANIZATIONS_REGISTRY_CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL)
+        with self._lock:
+            generation = caching.organization_cache_generation()
+            now = time.monotonic()
+            if (
+                self._snapshot is None
+                or self._checked_generation != generation
+                or now - self._checked_at >= check_interval
+            ):
+                # Read the stamp before the rows, so that a concurrent write
+                # makes the next check rebuild the snapshot.
+                stamp = self._version_stamp()
+                if self._snapshot is None or self._snapshot.stamp != stamp:
+                    self._snapshot = self._build_snapshot(stamp)
+                self._checked_at = now
+                self._checked_generation = generation
+            return self._snapshot
+
+    def get_by_id(self, organization_id):
+        """
+        Return the record of the active organization with the given id, or None.
+        """
+        try:
+            organization_id = int(organization_id)
+        except (TypeError, ValueError):
+            return None
+        return self._current_snapshot().records_by_id.get(organization_id)
+
+    def get_by_short_name(self, short_name, case_insensitive=False):
+        """
+        Return the record of the active organization with the given short name, or None.
+
+        If `case_insensitive`, or if the database compares short names
+        case-insensitively (so that an exact lookup in the database would),
+        prefer an exact match among organizations whose short names differ only
+        by case, and else the one with the lowest id.
+        """
+        matches = self._current_snapshot().records_by_lowered_short_name.get(short_name.lower(), ())
+        for record in matches:
+            if record.short_name == short_name:
+                return record
+        if matches and (case_insensitive or connection.vendor in CASE_INSENSITIVE_VENDORS):
+            return matches[0]
+        return None
+
+    def all(self):
+        """
+        Return the records of every active organization, ordered by id.
+        """
+        return self._current_snapshot().records
+
+    def clear(self):
+        """
+        Drop the snapshot, so that it is rebuilt on the next read.
+        """
+        with self._lock:
+            self._snapshot = None
+
+
+organization_registry = OrganizationRegistry()
+
+
+def registry_enabled():
+    """
+    Return whether lookups of organizations should be served by the registry.
+
+    They are not while the current transaction has uncommitted writes to organizations.
+    """
+    return (
+        bool(getattr(settings, 'ORGANIZATIONS_REGISTRY_ENABLED', False))
+        and not caching.organizations_written_in_transaction()
+    )
@@ -2,27 +2,38 @@
 Data layer serialization operations.  Converts querysets to simple
 python containers (mainly arrays and dicts).
 """
-import requests
-
-from django.core.files.base import ContentFile
 from rest_framework import serializers
 
-from organizations import models
+from organizations import logos, models
 
 
 class OrganizationSerializer(serializers.ModelSerializer):
     """ Serializes the Organization object."""
     logo_url = serializers.CharField(write_only=True, required=False)
+    logo_status = serializers.SerializerMethodField()
 
     class Meta:
         model = models.Organization
         fields = ('id', 'created', 'modified', 'name', 'short_name', 'description', 'logo',
-                  'active', 'logo_url',)
+                  'active', 'logo_url', 'logo_status',)
+
+    def get_logo_status(self, obj):
+        """
+        Return the status of the latest download of the organization's logo
+        from a `logo_url`, or None if there was none.
+        """
+        try:
+            return obj.logo_fetch.status
+        except models.OrganizationLogoFetch.DoesNotExist:
+            return None
 
     def update_logo(self, obj, logo_url):
-        if logo_url:  # pragma: no cover
-            logo = requests.get(logo_url)  # pylint: disable=missing-timeout
-            obj.logo.save(logo_url.split('/')[-1], ContentFile(logo.content))
+        """
+        Schedule the download of the organization's logo, which happens in
+        the background once the request's transaction commits.
+        """
+        if logo_url:
+            logos.schedule_logo_fetch(obj, logo_url)
 
     def create(self, validated_data):
         """
@@ -73,6 +84,20 @@ def serialize_organization_with_course(organization_course):
     }
 
 
+def serialize_organization_logo_fetch(logo_fetch):
+    """
+    OrganizationLogoFetch object-to-dict serialization
+    """
+    return {
+        'organization_id': logo_fetch.organization_id,
+        'source_url': logo_fetch.source_url,
+        'status': logo_fetch.status,
+        'attempts': logo_fetch.attempts,
+        'error': logo_fetch.error,
+        'modified': logo_fetch.modified,
+    }
+
+
 def serialize_organizations(organizations):
     """
     Organization serialization
@@ -3,8 +3,9 @@ Organizations Admin Module Test Cases
 """
 
 from django.contrib.admin.sites import AdminSite
+from django.contrib.messages import get_messages
 from django.contrib.messages.storage.fallback import FallbackStorage
-from django.test import RequestFactory
+from django.test import RequestFactory, override_settings
 
 from organizations.tests import utils
 from organizations.admin import OrganizationAdmin, OrganizationCourseAdmin
@@ -94,6 +95,54 @@ class OrganizationsAdminTestCase(utils.OrganizationsTestCaseBase):
         self.assertTrue(Organization.objects.get(pk=1).active)
         self.assertTrue(Organization.objects.get(pk=2).active)
 
+    def test_bulk_actions_are_not_audited_by_default(self):
+        """
+        Test: by default, bulk actions skip the history table and warn about it.
+        """
+        create_organization(1, active=True)
+        history = Organization.history.model.objects  # pylint: disable=no-member
+        history_count = history.count()
+        self.org_admin.deactivate_selected(self.request, Organization.objects.all())
+        self.assertEqual(history.count(), history_count)
+        self.assertIn(OrganizationAdmin.HISTORY_DISCLAIMER, [str(m) for m in get_messages(self.request)])
+
+    @override_settings(ORGANIZATIONS_ADMIN_AUDITED_BULK_ACTIONS=True)
+    def test_audited_bulk_actions(self):
+        """
+        Test: audited bulk actions write history records on behalf of the acting user.
+        """
+        for i in range(3):
+            create_organization(i, active=True)
+        history = Organization.history.model.objects  # pylint: disable=no-member
+
+        # Select the ids, update, select the changed records and insert their history records.
+        with self.assertNumQueries(4):
+            self.org_admin.deactivate_selected(self.request, Organization.objects.all())
+        self.assertFalse(Organization.objects.filter(active=True).exists())
+        records = history.filter(history_type='~')
+        self.assertEqual(records.count(), 3)
+        self.assertEqual({(r.active, r.history_user_id) for r in records}, {(False, self.admin_user.id)})
+
+        self.org_admin.activate_selected(self.request, Organization.objects.filter(pk=1))
+        self.assertEqual(history.filter(history_type='~', active=True, history_user=self.admin_user).count(), 1)
+        messages = [str(m) for m in get_messages(self.request)]
+        self.assertIn('3 OrganizationAdmin entries were successfully deactivated.', messages)
+        self.assertIn('1 OrganizationAdmin entry was successfully activated.', messages)
+        self.assertNotIn(OrganizationAdmin.HISTORY_DISCLAIMER, messages)
+
+    @override_settings(ORGANIZATIONS_ADMIN_AUDITED_BULK_ACTIONS=True)
+    def test_audited_bulk_actions_on_linkages(self):
+        """
+        Test: audited bulk actions also apply to organization-course linkages.
+        """
+        create_organization(1, active=True)
+        OrganizationCourse.objects.create(organization_id=1, course_id=str(self.test_course_key))
+        course_admin = OrganizationCourseAdmin(OrganizationCourse, AdminSite())
+        course_admin.deactivate_selected(self.request, OrganizationCourse.objects.all())
+        self.assertFalse(OrganizationCourse.objects.get().active)
+        history = OrganizationCourse.history.model.objects  # pylint: disable=no-member
+        self.assertEqual(history.get(history_type='~').history_user, self.admin_user)
+
 
 class OrganizationCourseAdminTestCase(utils.OrganizationsTestCaseBase):
     """
@@ -5,10 +5,13 @@ import itertools
 from unittest.mock import patch
 
 import ddt
+from django.core.cache import cache
+from django.db import connection
 from django.test import override_settings
 from opaque_keys.edx.keys import CourseKey
 
 from organizations import api
+from organizations import data
 from organizations import exceptions
 from organizations import models
 from organizations.tests import utils
@@ -179,6 +182,23 @@ class OrganizationsApiTestCase(utils.OrganizationsTestCaseBase):
             with self.assertRaises(exceptions.InvalidOrganizationException):
                 api.get_organization_by_short_name('not_existing')
 
+    def test_get_organization_by_short_name_case_insensitive(self):
+        """ Unit Test: get_organization_by_short_name with case_insensitive """
+        api.add_organization({'name': 'Upper', 'short_name': 'ORGX'})
+        with self.assertNumQueries(1):
+            organization = api.get_organization_by_short_name('orgx', case_insensitive=True)
+        self.assertEqual(organization['name'], 'Upper')
+        with self.assertRaises(exceptions.InvalidOrganizationException):
+            api.get_organization_by_short_name('orgx')
+
+        # An exact match wins over other organizations differing only by case.
+        api.add_organization({'name': 'Lower', 'short_name': 'orgx'})
+        self.assertEqual(api.get_organization_by_short_name('orgx', case_insensitive=True)['name'], 'Lower')
+        self.assertEqual(api.get_organization_by_short_name('Orgx', case_insensitive=True)['name'], 'Upper')
+
+        with self.assertRaises(exceptions.InvalidOrganizationException):
+            api.get_organization_by_short_name('not_existing', case_insensitive=True)
+
     def test_get_organizations(self):
         """ Unit Test: test_get_organizations """
         api.add_organization({
@@ -211,6 +231,38 @@ class OrganizationsApiTestCase(utils.OrganizationsTestCaseBase):
         with self.assertRaises(exceptions.InvalidOrganizationException):
             api.get_organization(self.test_organization['id'])
 
+    def test_remove_and_add_organization_with_many_relationships(self):
+        """ Unit Test: the activation cascade takes a constant number of queries """
+        organization = models.Organization.objects.get(id=self.test_organization['id'])
+        models.OrganizationCourse.objects.bulk_create([
+            models.OrganizationCourse(organization=organization, course_id=f'course-v1:edX+C{index}+Run')
+            for index in range(50)
+        ])
+        linkage_history = models.OrganizationCourse.history.model.objects  # pylint: disable=no-member
+        organization_history = models.Organization.history.model.objects  # pylint: disable=no-member
+
+        # Update both tables, then select the changed rows and insert their history.
+        with self.assertNumQueries(6):
+            api.remove_organization(self.test_organization['id'])
+        assert not models.OrganizationCourse.objects.filter(active=True).exists()
+        assert linkage_history.filter(history_type='~', active=False).count() == 50
+        assert organization_history.filter(history_type='~', active=False).count() == 1
+
+        with self.assertNumQueries(7):
+            api.add_organization(self.test_organization)
+        assert len(api.get_organization_courses(self.test_organization)) == 50
+        assert linkage_history.filter(history_type='~', active=True).count() == 50
+        assert organization_history.filter(history_type='~', active=True).count() == 1
+
+    @patch.object(data, 'QUERY_CHUNK_SIZE', 2)
+    def test_remove_organization_in_one_update(self):
+        """ Unit Test: relationships are updated at once, whatever the chunk size """
+        for index in range(3):
+            api.add_organization_course(self.test_organization, CourseKey.from_string(f'course-v1:edX+C{index}+Run'))
+        with self.assertNumQueries(6):
+            api.remove_organization(self.test_organization['id'])
+        assert not models.OrganizationCourse.objects.filter(active=True).exists()
+
     def test_remove_organization_bogus_organization(self):
         """ Unit Test: test_remove_organization_bogus_organization """
         with self.assertNumQueries(4):
@@ -228,11 +280,14 @@ class OrganizationsApiTestCase(utils.OrganizationsTestCaseBase):
 
     def test_add_organization_course(self):
         """ Unit Test: test_add_organization_course """
-        with self.assertNumQueries(3):
+        # Select, upsert, select and history insert.
+        with self.assertNumQueries(4):
             api.add_organization_course(
                 self.test_organization,
                 self.test_course_key
             )
+        history = models.OrganizationCourse.history.model.objects  # pylint: disable=no-member
+        assert list(history.values_list('history_type', 'active')) == [('+', True)]
 
     def test_add_organization_course_active_exists(self):
         """ Unit Test: test_add_organization_course_active_exists """
@@ -240,11 +295,16 @@ class OrganizationsApiTestCase(utils.OrganizationsTestCaseBase):
             self.test_organization,
             self.test_course_key
         )
-        with self.assertNumQueries(1):
-            api.add_organization_course(
-                self.test_organization,
-                self.test_course_key
-            )
+        with patch.object(data.caching, 'invalidate_course_organizations') as mock_invalidate:
+            with self.assertNumQueries(1):
+                api.add_organization_course(
+                    self.test_organization,
+                    self.test_course_key
+                )
+        mock_invalidate.assert_not_called()
+        assert models.OrganizationCourse.objects.get().active
+        history = models.OrganizationCourse.history.model.objects  # pylint: disable=no-member
+        assert not history.filter(history_type='~').exists()
 
     def test_add_organization_course_inactive_to_active(self):
         """ Unit Test: test_add_organization_course_inactive_to_active """
@@ -253,11 +313,39 @@ class OrganizationsApiTestCase(utils.OrganizationsTestCaseBase):
             self.test_course_key
         )
         api.remove_organization_course(self.test_organization, self.test_course_key)
-        with self.assertNumQueries(4):
+        with self.assertNumQueries(3):
             api.add_organization_course(
                 self.test_organization,
                 self.test_course_key
             )
+        assert models.OrganizationCourse.objects.get().active
+        history = models.OrganizationCourse.history.model.objects  # pylint: disable=no-member
+        assert history.latest('history_id').history_type == '~'
+
+    def test_add_organization_course_inactive_organization(self):
+        """ Unit Test: linkages of inactive organizations are not reactivated """
+        api.add_organization_course(self.test_organization, self.test_course_key)
+        api.remove_organization(self.test_organization['id'])
+        with self.assertRaises(exceptions.InvalidOrganizationException):
+            api.add_organization_course(self.test_organization, self.test_course_key)
+        assert not models.OrganizationCourse.objects.get().active
+
+    def test_add_organization_course_concurrent_creation(self):
+        """ Unit Test: a linkage created concurrently is reactivated by the upsert """
+        filter_linkages = models.OrganizationCourse.objects.filter
+
+        def lookup_before_concurrent_creation(*args, **kwargs):
+            linkages = filter_linkages(*args, **kwargs)
+            models.OrganizationCourse.objects.create(
+                organization_id=self.test_organization['id'], course_id=str(self.test_course_key), active=False,
+            )
+            return linkages.none()
+
+        with patch.object(models.OrganizationCourse.objects, 'filter', side_effect=lookup_before_concurrent_creation):
+            api.add_organization_course(self.test_organization, self.test_course_key)
+        assert models.OrganizationCourse.objects.get().active
+        history = models.OrganizationCourse.history.model.objects  # pylint: disable=no-member
+        assert history.latest('history_id').history_type == '~'
 
     def test_add_organization_course_bogus_course_key(self):
         """ Unit Test: test_add_organization_course_bogus_course_key """
@@ -359,6 +447,38 @@ class OrganizationsApiTestCase(utils.OrganizationsTestCaseBase):
             api.remove_course_references(self.test_course_key)
         self.assertEqual(len(api.get_organization_courses(self.test_organization)), 0)
 
+    @patch.object(data, 'QUERY_CHUNK_SIZE', 2)
+    def test_bulk_remove_course_references(self):
+        """ Unit Test: test_bulk_remove_course_references """
+        other_organization = api.add_organization(self.make_organization_data('other_organization'))
+        course_keys = [CourseKey.from_string(f'course-v1:edX+C{index}+Run') for index in range(3)]
+        for course_key in course_keys:
+            api.add_organization_course(self.test_organization, course_key)
+        api.add_organization_course(other_organization, course_keys[0])
+        api.add_organization_course(other_organization, self.test_course_key)
+        unlinked_course_key = 'course-v1:edX+Unlinked+Run'
+
+        # Two chunks of course ids, each updated, then selected for the history insert.
+        with self.assertNumQueries(6):
+            removed_counts = api.bulk_remove_course_references(course_keys + [unlinked_course_key])
+        assert removed_counts == {course_keys[0]: 2, course_keys[1]: 1, course_keys[2]: 1, unlinked_course_key: 0}
+        assert api.get_organization_courses(self.test_organization) == []
+        assert [linkage['course_id'] for linkage in api.get_organization_courses(other_organization)] == [
+            str(self.test_course_key)
+        ]
+        history = models.OrganizationCourse.history.model.objects  # pylint: disable=no-member
+        assert history.filter(history_type='~', active=False).count() == 4
+
+        with self.assertNumQueries(2):
+            assert api.bulk_remove_course_references(course_keys) == dict.fromkeys(course_keys, 0)
+
+    def test_bulk_remove_course_references_invalid_key(self):
+        """ Unit Test: test_bulk_remove_course_references_invalid_key """
+        api.add_organization_course(self.test_organization, self.test_course_key)
+        with self.assertRaises(exceptions.InvalidCourseKeyException):
+            api.bulk_remove_course_references([self.test_course_key, 'not a course key'])
+        assert len(api.get_organization_courses(self.test_organization)) == 1
+
     @patch.object(api.log, 'info')
     def test_ensure_organization_retrieves_known_org(self, mock_log_info):
         """
@@ -427,6 +547,68 @@ class OrganizationsApiTestCase(utils.OrganizationsTestCaseBase):
         with self.assertRaises(exceptions.InvalidOrganizationException):
             api.get_organization_by_short_name('myorg')
 
+    def test_ensure_organization_queries(self):
+        """
+        Test that ``ensure_organization`` reads an organization once, and creates
+        a missing one without reading it again.
+        """
+        # Select, then savepoint, insert, history insert and savepoint release.
+        with self.assertNumQueries(5):
+            org_data = api.ensure_organization('myorg')
+        with self.assertNumQueries(1):
+            assert api.ensure_organization('myorg') == org_data
+        # The cache is not used by the (test) transaction which created the organization.
+        with override_settings(ORGANIZATIONS_LOCAL_CACHE_ENABLED=True):
+            api.ensure_organization('myorg')
+            with self.assertNumQueries(1):
+                assert api.ensure_organization('myorg') == org_data
+
+    def test_ensure_organization_reactivates_inactive_org(self):
+        """
+        Test that ``ensure_organization`` reactivates an inactive organization
+        rather than creating it again.
+        """
+        org_data = api.add_organization({'short_name': 'myorg', 'name': 'My Org'})
+        api.remove_organization(org_data['id'])
+        assert api.ensure_organization('myorg') == org_data
+        assert api.get_organization_by_short_name('myorg') == org_data
+
+    @override_settings(ORGANIZATIONS_AUTOCREATE=False)
+    def test_ensure_organization_raises_for_inactive_org_no_autocreate(self):
+        """
+        Test that, with organization auto-create DISABLED, ``ensure_organization``
+        does not reactivate inactive organizations.
+        """
+        org_data = api.add_organization({'short_name': 'myorg', 'name': 'My Org'})
+        api.remove_organization(org_data['id'])
+        with self.assertRaises(exceptions.InvalidOrganizationException):
+            api.ensure_organization('myorg')
+        assert not models.Organization.objects.get(short_name='myorg').active
+
+    def test_ensure_organization_concurrent_creation(self):
+        """
+        Test that ``ensure_organization`` returns the organization created by
+        a concurrent request between its lookup and its insert.
+        """
+        filter_organizations = models.Organization.objects.filter
+
+        def lookup_before_concurrent_creation(*args, **kwargs):
+            organizations = list(filter_organizations(*args, **kwargs))
+            models.Organization.objects.create(short_name='myorg', name='Their Org')
+            return models.Organization.objects.none() if not organizations else organizations
+
+        with patch.object(models.Organization.objects, 'filter', side_effect=lookup_before_concurrent_creation):
+            org_data = api.ensure_organization('myorg')
+        assert org_data['name'] == 'Their Org'
+        assert models.Organization.objects.filter(short_name='myorg').count() == 1
+
+    def test_ensure_organization_empty_short_name(self):
+        """
+        Test that ``ensure_organization`` rejects empty short names.
+        """
+        with self.assertRaises(exceptions.InvalidOrganizationException):
+            api.ensure_organization('')
+
     def test_autocreate_enabled_by_default(self):
         """
         Test that, by default, automatic organization creation is enabled.
@@ -434,6 +616,68 @@ class OrganizationsApiTestCase(utils.OrganizationsTestCaseBase):
         assert api.is_autocreate_enabled()
 
 
+class EnsureOrganizationsTestCase(utils.OrganizationsTestCaseBase):
+    """
+    Tests for `api.ensure_organizations`.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.existing = api.add_organization(self.make_organization_data('existing'))
+        self.inactive = api.add_organization(self.make_organization_data('inactive'))
+        api.remove_organization(self.inactive['id'])
+
+    @patch.object(api.log, 'info')
+    def test_ensure_organizations(self, mock_log_info):
+        organizations = api.ensure_organizations(['EXISTING', 'inactive', 'new_a', 'new_b', 'NEW_A'])
+        assert set(organizations) == {'EXISTING', 'inactive', 'new_a', 'new_b', 'NEW_A'}
+        assert organizations['EXISTING'] == self.existing
+        assert organizations['inactive'] == self.inactive
+        assert organizations['new_a'] == organizations['NEW_A'] == api.get_organization_by_short_name('NEW_A')
+        assert organizations['new_b'] == api.get_organization_by_short_name('new_b')
+        mock_log_info.assert_called_once_with("Automatically created new organizations: %s.", 'NEW_A, new_b')
+        history = models.Organization.history.model.objects  # pylint: disable=no-member
+        assert history.filter(short_name__in=['NEW_A', 'new_b'], history_type='+').count() == 2
+
+    def test_queries(self):
+        # Select, then savepoint, insert, history insert and savepoint release.
+        with self.assertNumQueries(5):
+            api.ensure_organizations(['existing', 'new_a', 'new_b'])
+        with self.assertNumQueries(1):
+            api.ensure_organizations(['existing', 'new_a', 'new_b'])
+
+    def test_ids_not_returned_by_bulk_insert(self):
+        with patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', False):
+            organizations = api.ensure_organizations(['new_a'])
+        assert organizations['new_a'] == api.get_organization_by_short_name('new_a')
+
+    def test_concurrent_creation(self):
+        query_organizations = data.query_organizations_by_short_name
+
+        def query_before_concurrent_creation(short_names):
+            organizations = list(query_organizations(short_names))
+            models.Organization.objects.create(short_name='new_a', name='Their Org')
+            return organizations
+
+        with patch.object(data, 'query_organizations_by_short_name', side_effect=query_before_concurrent_creation):
+            organizations = api.ensure_organizations(['new_a', 'new_b'])
+        assert organizations['new_a']['name'] == 'Their Org'
+        assert organizations['new_b'] == api.get_organization_by_short_name('new_b')
+
+    @override_settings(ORGANIZATIONS_AUTOCREATE=False)
+    def test_no_autocreate(self):
+        assert api.ensure_organizations(['existing']) == {'existing': self.existing}
+        for short_names in (['existing', 'new_a'], ['inactive']):
+            with self.assertRaises(exceptions.InvalidOrganizationException):
+                api.ensure_organizations(short_names)
+        assert not models.Organization.objects.filter(short_name='new_a').exists()
+        assert not models.Organization.objects.get(short_name='inactive').active
+
+    def test_empty_short_name(self):
+        with self.assertRaises(exceptions.InvalidOrganizationException):
+            api.ensure_organizations(['existing', ''])
+
+
 class BulkAddOrganizationsTestCase(utils.OrganizationsTestCaseBase):
     """
     Tests for `api.bulk_add_organizations`.
@@ -649,6 +893,85 @@ class BulkAddOrganizationsTestCase(utils.OrganizationsTestCaseBase):
             ])
         assert len(api.get_organizations()) == 11
 
+    @patch.object(data_module_logger, 'info', autospec=True)
+    def test_batches(self, mock_log_info):
+        """
+        Test that bulk_add_organizations can stream a generator in batches,
+        deduplicating short names within a batch, finding those of earlier
+        batches in the database, and reporting progress.
+        """
+        api.remove_organization(
+            api.add_organization(
+                self.make_organization_data("org_to_reactivate")
+            )["id"]
+        )
+        short_names = [
+            "org_a", "org_b", "ORG_A",  # Batch 1; ORG_A duplicates org_a.
+            "org_c", "org_to_reactivate", "Org_B",  # Batch 2; Org_B duplicates org_b.
+            "org_d",  # Batch 3.
+        ]
+        progress = []
+        created, reactivated = api.bulk_add_organizations(
+            (self.make_organization_data(short_name) for short_name in short_names),
+            batch_size=3,
+            progress_callback=lambda *counts: progress.append(counts),
+        )
+        assert created == {"org_a", "org_b", "org_c", "org_d"}
+        assert reactivated == {"org_to_reactivate"}
+        assert progress == [(3, 2, 0), (6, 3, 1), (7, 4, 1)]
+        assert len(api.get_organizations()) == 5
+
+        dropped_short_names = [call[0][1]["short_name"] for call in mock_log_info.call_args_list]
+        assert dropped_short_names == ["ORG_A"]
+
+    def test_batches_counts_only(self):
+        """
+        Test that bulk_add_organizations can return counts instead of short names.
+        """
+        api.remove_organization(
+            api.add_organization(
+                self.make_organization_data("org_to_reactivate")
+            )["id"]
+        )
+        short_names = ["org_a", "org_b", "org_to_reactivate", "ORG_A", "org_c"]
+        progress = []
+        counts = api.bulk_add_organizations(
+            (self.make_organization_data(short_name) for short_name in short_names),
+            batch_size=2,
+            progress_callback=lambda *counts: progress.append(counts),
+            counts_only=True,
+        )
+        assert counts == (3, 1)
+        assert progress == [(2, 2, 0), (4, 2, 1), (5, 3, 1)]
+        assert len(api.get_organizations()) == 4
+
+    def test_batches_dry_run(self):
+        """
+        Test that a batched dry run reports each organization once, even when
+        its short name appears again in a later batch.
+        """
+        would_create, would_reactivate = api.bulk_add_organizations(
+            [self.make_organization_data(short_name) for short_name in ("org_a", "org_b", "ORG_A")],
+            dry_run=True,
+            batch_size=2,
+        )
+        assert would_create == {"org_a", "org_b"}
+        assert would_reactivate == set()
+        assert api.get_organizations() == []
+
+    def test_batches_validation_error(self):
+        """
+        Test that, in batched mode, batches before an invalid item are stored.
+        """
+        organization_data_items = [
+            self.make_organization_data("org_a"),
+            self.make_organization_data("org_b"),
+            {"description": "org with no short_name!"},
+        ]
+        with self.assertRaises(exceptions.InvalidOrganizationException):
+            api.bulk_add_organizations(iter(organization_data_items), batch_size=2)
+        assert {org["short_name"] for org in api.get_organizations()} == {"org_a", "org_b"}
+
 
 class BulkAddOrganizationCoursesTestCase(utils.OrganizationsTestCaseBase):
     """
@@ -684,8 +1007,8 @@ class BulkAddOrganizationCoursesTestCase(utils.OrganizationsTestCaseBase):
         """
         Test that `bulk_add_organization_courses` works given an an empty list.
         """
-        # 1 query to load list of existing org-courses.
-        with self.assertNumQueries(1):
+        # Nothing to load, reactivate or create.
+        with self.assertNumQueries(0):
             api.bulk_add_organization_courses([])
 
     def test_dry_run(self):
@@ -726,12 +1049,11 @@ class BulkAddOrganizationCoursesTestCase(utils.OrganizationsTestCaseBase):
         api.add_organization_course(org_a, course_key_z)
         api.remove_organization_course(org_a, course_key_z)
 
-        # 1 query to load list of existing linkages,
-        # 1 query to fetch organizations for existing linkages,
+        # 1 query to load existing linkages (with their organizations) of the requested courses,
         # 1 query to ensure all existing linkages active,
         # 1 query to get organiations for new linkages,
         # 1 query to create new linkages.
-        with self.assertNumQueries(5):
+        with self.assertNumQueries(4):
             created, reactivated = api.bulk_add_organization_courses([
 
                 # A->X: Existing linkage, should be a no-op.
@@ -862,12 +1184,11 @@ class BulkAddOrganizationCoursesTestCase(utils.OrganizationsTestCaseBase):
         api.add_organization_course(org_a, course_key_y)
         api.remove_organization_course(org_a, course_key_y)
 
-        # 1 query to load list of existing linkages,
-        # 1 query to fetch organizations for existing linkages,
+        # 1 query to load existing linkages (with their organizations) of the requested courses,
         # 1 query to ensure all existing linkages active,
         # 1 query to get organiations for new linkages,
         # 1 query to create new linkages.
-        with self.assertNumQueries(5):
+        with self.assertNumQueries(4):
             api.bulk_add_organization_courses([
                 (org_a, course_key_x),  # Already existing.
                 (org_a, course_key_x),  # Already existing.
@@ -885,3 +1206,228 @@ class BulkAddOrganizationCoursesTestCase(utils.OrganizationsTestCaseBase):
         assert len(api.get_organization_courses(org_a)) == 3
         assert len(api.get_organization_courses(org_b)) == 3
         assert len(api.get_organization_courses(org_c)) == 3
+
+    def test_only_requested_linkages_are_loaded(self):
+        """
+        Test that bulk_add_organization_courses only loads the linkages of the
+        requested courses, in chunks, and accepts a generator of pairs.
+        """
+        org_a = api.add_organization(self.make_organization_data("org_a"))
+        org_b = api.add_organization(self.make_organization_data("org_b"))
+        for index in range(5):
+            api.add_organization_course(org_a, f"course-v1:other+other+{index}")
+        api.add_organization_course(org_b, "course-v1:x+x+x")
+        api.add_organization_course(org_a, "course-v1:y+y+y")
+        api.remove_organization_course(org_a, "course-v1:y+y+y")
+
+        pairs = [
+            (org_a, "course-v1:x+x+x"),  # New; course has a linkage to another org.
+            (org_a, "course-v1:y+y+y"),  # Reactivation.
+            (org_a, "course-v1:z+z+z"),  # New.
+        ]
+        # 2 chunks of existing linkages, 1 reactivation, 1 organization fetch and 1 create.
+        with patch.object(data, "QUERY_CHUNK_SIZE", 2):
+            with self.assertNumQueries(5):
+                created, reactivated = api.bulk_add_organization_courses(pair for pair in pairs)
+        assert created == {("org_a", "course-v1:x+x+x"), ("org_a", "course-v1:z+z+z")}
+        assert reactivated == {("org_a", "course-v1:y+y+y")}
+        assert len(api.get_organization_courses(org_a)) == 8
+        assert len(api.get_organization_courses(org_b)) == 1
+
+    def test_reactivations_and_organizations_in_chunks(self):
+        """
+        Test that linkages are reactivated, and organizations fetched, a chunk at a time.
+        """
+        org_a = api.add_organization(self.make_organization_data("org_a"))
+        org_b = api.add_organization(self.make_organization_data("org_b"))
+        for organization in (org_a, org_b):
+            api.add_organization_course(organization, "course-v1:y+y+y")
+            api.remove_organization_course(organization, "course-v1:y+y+y")
+
+        pairs = [
+            (org_a, "course-v1:y+y+y"),
+            (org_b, "course-v1:y+y+y"),
+            (org_a, "course-v1:z+z+z"),
+            (org_b, "course-v1:z+z+z"),
+        ]
+        # 2 chunks of existing linkages, 2 of reactivations, 2 of organizations and 1 create.
+        with patch.object(data, "QUERY_CHUNK_SIZE", 1):
+            with self.assertNumQueries(7):
+                created, reactivated = api.bulk_add_organization_courses(pairs)
+        assert created == {("org_a", "course-v1:z+z+z"), ("org_b", "course-v1:z+z+z")}
+        assert reactivated == {("org_a", "course-v1:y+y+y"), ("org_b", "course-v1:y+y+y")}
+        assert len(api.get_organization_courses(org_a)) == 2
+        assert len(api.get_organization_courses(org_b)) == 2
+
+
+class BulkRemoveOrganizationCoursesTestCase(utils.OrganizationsTestCaseBase):
+    """
+    Tests for `api.bulk_remove_organization_courses`.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.org_a = api.add_organization(self.make_organization_data("org_a"))
+        self.org_b = api.add_organization(self.make_organization_data("org_b"))
+        for course_id in ("course-v1:x+x+x", "course-v1:y+y+y", "course-v1:z+z+z"):
+            api.add_organization_course(self.org_a, course_id)
+            api.add_organization_course(self.org_b, course_id)
+        api.remove_organization_course(self.org_a, "course-v1:z+z+z")
+
+    def test_validation_errors(self):
+        """
+        Test that bad input raises, and no linkages are deactivated.
+        """
+        with self.assertRaises(exceptions.InvalidCourseKeyException):
+            api.bulk_remove_organization_courses([
+                (self.org_a, "course-v1:x+x+x"),
+                (self.org_a, "NOT-A-COURSE-KEY"),
+            ])
+        with self.assertRaises(exceptions.InvalidOrganizationException):
+            api.bulk_remove_organization_courses([
+                (self.org_a, "course-v1:x+x+x"),
+                ({"description": "org with no short_name!"}, "course-v1:x+x+x"),
+            ])
+        assert len(api.get_organization_courses(self.org_a)) == 2
+
+    def test_remove_no_organization_courses(self):
+        with self.assertNumQueries(0):
+            assert api.bulk_remove_organization_courses([]) == set()
+
+    def test_dry_run(self):
+        with self.assertNumQueries(1):
+            would_deactivate = api.bulk_remove_organization_courses(
+                [(self.org_a, "course-v1:x+x+x")], dry_run=True
+            )
+        assert would_deactivate == {("org_a", "course-v1:x+x+x")}
+        assert len(api.get_organization_courses(self.org_a)) == 2
+
+    def test_remove_organization_courses(self):
+        """
+        Test that only active, requested linkages are deactivated, in chunks,
+        with their history records.
+        """
+        pairs = [
+            (self.org_a, "course-v1:x+x+x"),
+            ({**self.org_a, "short_name": "ORG_A"}, CourseKey.from_string("course-v1:y+y+y")),
+            (self.org_a, "course-v1:y+y+y"),  # Redundant.
+            (self.org_a, "course-v1:z+z+z"),  # Already inactive.
+            (self.org_a, "course-v1:w+w+w"),  # Nonexistent.
+        ]
+        # 2 chunks of active linkages, then 1 update, 1 select of the changed linkages and 1 history insert.
+        with patch.object(data, "QUERY_CHUNK_SIZE", 2):
+            with self.assertNumQueries(5):
+                deactivated = api.bulk_remove_organization_courses(pair for pair in pairs)
+        assert deactivated == {("org_a", "course-v1:x+x+x"), ("org_a", "course-v1:y+y+y")}
+        assert api.get_organization_courses(self.org_a) == []
+        assert len(api.get_organization_courses(self.org_b)) == 3
+        history = models.OrganizationCourse.history.model.objects  # pylint: disable=no-member
+        assert history.filter(organization_id=self.org_a['id'], history_type='~', active=False).count() == 3
+
+    def test_invalidates_course_organizations_cache(self):
+        with override_settings(ORGANIZATIONS_COURSE_CACHE_ENABLED=True):
+            assert len(api.get_course_organizations("course-v1:x+x+x")) == 2
+            api.bulk_remove_organization_courses([(self.org_a, "course-v1:x+x+x")])
+            assert len(api.get_course_organizations("course-v1:x+x+x")) == 1
+
+
+class BatchGetOrganizationsTestCase(utils.OrganizationsTestCaseBase):
+    """
+    Tests for `api.get_organizations_by_short_names` and `api.get_organizations_by_ids`.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.org_a = api.add_organization(self.make_organization_data("org_a"))
+        self.org_b = api.add_organization(self.make_organization_data("Org_B"))
+        self.inactive_org = api.add_organization(self.make_organization_data("inactive_org"))
+        api.remove_organization(self.inactive_org["id"])
+
+    def test_get_organizations_by_short_names(self):
+        with self.assertNumQueries(1):
+            organizations = api.get_organizations_by_short_names(
+                ["org_a", "ORG_A", "org_b", "inactive_org", "missing_org"]
+            )
+        assert set(organizations) == {"org_a", "ORG_A", "org_b"}
+        assert organizations["org_a"] == self.org_a
+        assert organizations["ORG_A"] == self.org_a
+        assert organizations["org_b"] == self.org_b
+
+    def test_get_organizations_by_short_names_empty(self):
+        with self.assertNumQueries(0):
+            assert not api.get_organizations_by_short_names(iter([]))
+
+    def test_get_organizations_by_ids(self):
+        with self.assertNumQueries(1):
+            organizations = api.get_organizations_by_ids(
+                organization["id"] for organization in (self.org_a, self.org_b, self.inactive_org)
+            )
+        assert organizations == {
+            self.org_a["id"]: self.org_a,
+            self.org_b["id"]: self.org_b,
+        }
+
+    @patch.object(data, "QUERY_CHUNK_SIZE", 1)
+    def test_lookups_are_chunked(self):
+        with self.assertNumQueries(2):
+            assert len(api.get_organizations_by_short_names(["org_a", "org_b"])) == 2
+        with self.assertNumQueries(2):
+            assert len(api.get_organizations_by_ids([self.org_a["id"], self.org_b["id"]])) == 2
+
+
+class BatchGetCourseOrganizationsTestCase(utils.OrganizationsTestCaseBase):
+    """
+    Tests for `api.get_organizations_for_courses` and `api.get_course_organization_ids`.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.org_a = api.add_organization(self.make_organization_data("org_a"))
+        self.org_b = api.add_organization(self.make_organization_data("org_b"))
+        self.course_key_x = CourseKey.from_string("course-v1:x+x+x")
+        self.course_key_y = CourseKey.from_string("course-v1:y+y+y")
+        self.course_key_z = CourseKey.from_string("course-v1:z+z+z")
+        api.add_organization_course(self.org_b, self.course_key_x)
+        api.add_organization_course(self.org_a, self.course_key_x)
+        api.add_organization_course(self.org_a, self.course_key_y)
+        api.add_organization_course(self.org_b, self.course_key_y)
+        api.remove_organization_course(self.org_b, self.course_key_y)
+
+    def test_get_organizations_for_courses(self):
+        course_keys = [self.course_key_x, str(self.course_key_y), self.course_key_z]
+        with self.assertNumQueries(1):
+            organizations = api.get_organizations_for_courses(iter(course_keys))
+        assert set(organizations) == set(course_keys)
+        assert [org["short_name"] for org in organizations[self.course_key_x]] == ["org_b", "org_a"]
+        assert [org["short_name"] for org in organizations[str(self.course_key_y)]] == ["org_a"]
+        assert organizations[self.course_key_z] == []
+        assert organizations[self.course_key_x] == api.get_course_organizations(self.course_key_x)
+
+    def test_get_course_organization_ids(self):
+        assert api.get_course_organization_ids([self.course_key_x, self.course_key_y, self.course_key_z]) == {
+            self.course_key_x: self.org_b["id"],
+            self.course_key_y: self.org_a["id"],
+            self.course_key_z: None,
+        }
+
+    def test_invalid_course_key(self):
+        with self.assertNumQueries(0):
+            with self.assertRaises(exceptions.InvalidCourseKeyException):
+                api.get_organizations_for_courses([self.course_key_x, "NOT-A-COURSE-KEY"])
+
+    @patch.object(data, "QUERY_CHUNK_SIZE", 2)
+    def test_lookups_are_chunked(self):
+        with self.assertNumQueries(2):
+            api.get_organizations_for_courses([self.course_key_x, self.course_key_y, self.course_key_z])
+
+    @override_settings(ORGANIZATIONS_COURSE_CACHE_ENABLED=True)
+    def test_uses_course_organizations_cache(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        api.get_course_organizations(self.course_key_x)
+        with self.assertNumQueries(1):
+            organizations = api.get_organizations_for_courses([self.course_key_x, self.course_key_y])
+        assert len(organizations[self.course_key_x]) == 2
+        with self.assertNumQueries(0):
+            assert api.get_organizations_for_courses([self.course_key_x, self.course_key_y]) == organizations
+            assert api.get_course_organizations(self.course_key_y) == organizations[self.course_key_y]
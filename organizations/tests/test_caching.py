@@ -0,0 +1,315 @@
+"""
+Tests for the data layer caches.
+"""
+from unittest.mock import patch
+
+from django.contrib.admin.sites import AdminSite
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.core.cache import cache
+from django.db import transaction
+from django.test import RequestFactory, override_settings
+
+from organizations import api
+from organizations import caching
+from organizations import data
+from organizations.admin import OrganizationAdmin, OrganizationCourseAdmin
+from organizations.models import Organization, OrganizationCourse
+from organizations.tests import utils
+from organizations.tests.factories import OrganizationFactory, UserFactory
+
+
+def make_admin_request():
+    """
+    Build a request suitable for calling admin actions directly.
+    """
+    request = RequestFactory().get('/admin')
+    request.user = UserFactory(is_staff=True)
+    request.session = 'session'
+    request._messages = FallbackStorage(request)  # pylint: disable=protected-access
+    return request
+
+
+class LocalTTLCacheTestCase(utils.OrganizationsTestCaseBase):
+    """
+    Tests for `caching.LocalTTLCache`.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.cache = caching.LocalTTLCache()
+
+    def test_get_and_set(self):
+        assert self.cache.get('a') is None
+        self.cache.set('a', 1, timeout=10, max_size=10)
+        assert self.cache.get('a') == 1
+
+    def test_expiry(self):
+        with patch.object(caching.time, 'monotonic', return_value=100):
+            self.cache.set('a', 1, timeout=10, max_size=10)
+        with patch.object(caching.time, 'monotonic', return_value=109):
+            assert self.cache.get('a') == 1
+        with patch.object(caching.time, 'monotonic', return_value=110):
+            assert self.cache.get('a') is None
+        assert len(self.cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set('a', 1, timeout=10, max_size=2)
+        self.cache.set('b', 2, timeout=10, max_size=2)
+        # Touch 'a' so that 'b' becomes the least recently used entry.
+        assert self.cache.get('a') == 1
+        self.cache.set('c', 3, timeout=10, max_size=2)
+        assert self.cache.get('b') is None
+        assert self.cache.get('a') == 1
+        assert self.cache.get('c') == 3
+
+    def test_clear(self):
+        self.cache.set('a', 1, timeout=10, max_size=10)
+        self.cache.clear()
+        assert self.cache.get('a') is None
+
+
+@override_settings(ORGANIZATIONS_LOCAL_CACHE_ENABLED=True)
+class OrganizationCacheTestCase(utils.OrganizationsTransactionTestCaseBase):
+    """
+    Tests for the process-local organization cache behind the data layer.
+
+    Writes are committed, as the cache is not used by a transaction which
+    has written organizations.
+    """
+
+    def setUp(self):
+        super().setUp()
+        caching.clear_organization_cache()
+        self.addCleanup(caching.clear_organization_cache)
+        self.organization = OrganizationFactory.create(short_name='cached_org')
+
+    def test_fetch_organization_is_cached(self):
+        with self.assertNumQueries(1):
+            first = data.fetch_organization(self.organization.id)
+        with self.assertNumQueries(0):
+            second = data.fetch_organization(self.organization.id)
+        assert first == second
+
+    def test_fetch_organization_by_short_name_is_cached(self):
+        with self.assertNumQueries(1):
+            api.get_organization_by_short_name('cached_org')
+        with self.assertNumQueries(0):
+            organization = api.get_organization_by_short_name('cached_org')
+        assert organization['id'] == self.organization.id
+
+    def test_ensure_organization_is_cached(self):
+        organization = api.ensure_organization('cached_org')
+        with self.assertNumQueries(0):
+            assert api.ensure_organization('cached_org') == organization
+
+    def test_case_insensitive_lookup_is_cached(self):
+        with self.assertNumQueries(1):
+            api.get_organization_by_short_name('CACHED_ORG', case_insensitive=True)
+        with self.assertNumQueries(0):
+            organization = api.get_organization_by_short_name('Cached_Org', case_insensitive=True)
+        assert organization['id'] == self.organization.id
+
+    def test_cached_values_are_copies(self):
+        organization = data.fetch_organization(self.organization.id)
+        organization['name'] = 'mutated by the caller'
+        assert data.fetch_organization(self.organization.id)['name'] == self.organization.name
+
+    def test_misses_are_not_cached(self):
+        with self.assertRaises(api.exceptions.InvalidOrganizationException):
+            api.get_organization_by_short_name('new_org')
+        OrganizationFactory.create(short_name='new_org')
+        assert api.get_organization_by_short_name('new_org')['short_name'] == 'new_org'
+
+    @override_settings(ORGANIZATIONS_LOCAL_CACHE_ENABLED=False)
+    def test_disabled(self):
+        data.fetch_organization(self.organization.id)
+        with self.assertNumQueries(1):
+            data.fetch_organization(self.organization.id)
+
+    @override_settings(ORGANIZATIONS_LOCAL_CACHE_MAX_SIZE=1)
+    def test_max_size(self):
+        other = OrganizationFactory.create()
+        data.fetch_organization(self.organization.id)
+        data.fetch_organization(other.id)
+        with self.assertNumQueries(1):
+            data.fetch_organization(self.organization.id)
+
+    def test_invalidated_on_save(self):
+        data.fetch_organization(self.organization.id)
+        self.organization.name = 'Renamed'
+        self.organization.save()
+        assert data.fetch_organization(self.organization.id)['name'] == 'Renamed'
+
+    def test_invalidated_on_remove(self):
+        api.get_organization(self.organization.id)
+        api.remove_organization(self.organization.id)
+        with self.assertRaises(api.exceptions.InvalidOrganizationException):
+            api.get_organization(self.organization.id)
+
+    def test_invalidated_by_bulk_create_organizations(self):
+        api.get_organization(self.organization.id)
+        Organization.objects.filter(id=self.organization.id).update(active=False)
+        api.bulk_add_organizations([self.make_organization_data('another_org')])
+        with self.assertRaises(api.exceptions.InvalidOrganizationException):
+            api.get_organization(self.organization.id)
+
+    def test_rolled_back_organizations_are_not_cached(self):
+        with transaction.atomic():
+            api.ensure_organization('ghost')
+            assert api.get_organization_by_short_name('ghost')['short_name'] == 'ghost'
+            transaction.set_rollback(True)
+        with self.assertRaises(api.exceptions.InvalidOrganizationException):
+            api.get_organization_by_short_name('ghost')
+
+    def test_writing_transaction_reads_its_own_writes(self):
+        data.fetch_organization(self.organization.id)
+        with transaction.atomic():
+            self.organization.name = 'Renamed'
+            self.organization.save()
+            with self.assertNumQueries(1):
+                assert data.fetch_organization(self.organization.id)['name'] == 'Renamed'
+            with self.assertNumQueries(1):
+                data.fetch_organization(self.organization.id)
+        with self.assertNumQueries(1):
+            data.fetch_organization(self.organization.id)
+        with self.assertNumQueries(0):
+            assert data.fetch_organization(self.organization.id)['name'] == 'Renamed'
+
+    def test_cleared_again_on_commit(self):
+        with transaction.atomic():
+            self.organization.name = 'Renamed'
+            self.organization.save()
+            # As if another thread cached the committed row before this transaction commits.
+            caching._organization_cache.set(  # pylint: disable=protected-access
+                ('id', self.organization.id), {'name': 'Stale'}, timeout=60, max_size=10
+            )
+        assert data.fetch_organization(self.organization.id)['name'] == 'Renamed'
+
+    def test_cached_again_after_rolled_back_savepoint(self):
+        with transaction.atomic():
+            with transaction.atomic():
+                OrganizationFactory.create()
+                assert caching.organizations_written_in_transaction()
+                transaction.set_rollback(True)
+            assert not caching.organizations_written_in_transaction()
+            data.fetch_organization(self.organization.id)
+            with self.assertNumQueries(0):
+                data.fetch_organization(self.organization.id)
+
+    def test_invalidated_by_admin_actions(self):
+        request = make_admin_request()
+        org_admin = OrganizationAdmin(Organization, AdminSite())
+
+        api.get_organization(self.organization.id)
+        org_admin.deactivate_selected(request, Organization.objects.filter(id=self.organization.id))
+        with self.assertRaises(api.exceptions.InvalidOrganizationException):
+            api.get_organization(self.organization.id)
+
+        org_admin.activate_selected(request, Organization.objects.filter(id=self.organization.id))
+        assert api.get_organization(self.organization.id)['id'] == self.organization.id
+
+
+@override_settings(ORGANIZATIONS_COURSE_CACHE_ENABLED=True)
+class CourseOrganizationsCacheTestCase(utils.OrganizationsTestCaseBase):
+    """
+    Tests for the shared course-organizations cache behind the data layer.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.organization = api.add_organization(self.make_organization_data('org_a'))
+        api.add_organization_course(self.organization, self.test_course_key)
+
+    def assert_course_organizations(self, short_names):
+        """
+        Assert the short names of the organizations linked to the test course.
+        """
+        assert [
+            organization['short_name']
+            for organization in api.get_course_organizations(self.test_course_key)
+        ] == short_names
+
+    def test_get_course_organizations_is_cached(self):
+        with self.assertNumQueries(1):
+            first = api.get_course_organizations(self.test_course_key)
+        with self.assertNumQueries(0):
+            second = api.get_course_organizations(self.test_course_key)
+            api.get_course_organization(self.test_course_key)
+            api.get_course_organization_id(self.test_course_key)
+        assert first == second
+        assert second[0]['course_id'] == str(self.test_course_key)
+
+    @override_settings(ORGANIZATIONS_COURSE_CACHE_ENABLED=False)
+    def test_disabled(self):
+        cache.clear()
+        api.get_course_organizations(self.test_course_key)
+        with self.assertNumQueries(1):
+            api.get_course_organizations(self.test_course_key)
+        assert cache.get(caching.COURSE_ORGANIZATIONS_GENERATION_KEY) is None
+
+    def test_invalidated_by_add_and_remove(self):
+        self.assert_course_organizations(['org_a'])
+        org_b = api.add_organization(self.make_organization_data('org_b'))
+        api.add_organization_course(org_b, self.test_course_key)
+        self.assert_course_organizations(['org_a', 'org_b'])
+        api.remove_organization_course(self.organization, self.test_course_key)
+        self.assert_course_organizations(['org_b'])
+        api.remove_course_references(self.test_course_key)
+        self.assert_course_organizations([])
+
+    def test_invalidated_by_organization_change(self):
+        self.assert_course_organizations(['org_a'])
+        api.remove_organization(self.organization['id'])
+        self.assert_course_organizations([])
+
+    def test_invalidated_by_bulk_add(self):
+        self.assert_course_organizations(['org_a'])
+        org_b = api.add_organization(self.make_organization_data('org_b'))
+        # Populate the cache again after the signal-driven invalidation above.
+        self.assert_course_organizations(['org_a'])
+        api.bulk_add_organization_courses([(org_b, self.test_course_key)], dry_run=True)
+        self.assert_course_organizations(['org_a'])
+        api.bulk_add_organization_courses([(org_b, self.test_course_key)])
+        self.assert_course_organizations(['org_a', 'org_b'])
+
+    def test_invalidated_by_admin_actions(self):
+        request = make_admin_request()
+        course_admin = OrganizationCourseAdmin(OrganizationCourse, AdminSite())
+        linkages = OrganizationCourse.objects.filter(course_id=str(self.test_course_key))
+
+        self.assert_course_organizations(['org_a'])
+        course_admin.deactivate_selected(request, linkages)
+        self.assert_course_organizations([])
+        course_admin.activate_selected(request, linkages)
+        self.assert_course_organizations(['org_a'])
+
+    def test_generation_survives_eviction(self):
+        self.assert_course_organizations(['org_a'])
+        generation = caching.course_organizations_generation()
+        cache.delete(caching.COURSE_ORGANIZATIONS_GENERATION_KEY)
+        caching.invalidate_course_organizations()
+        assert caching.course_organizations_generation() > generation
+
+    def test_generation_is_initialized_on_read(self):
+        cache.clear()
+        assert caching.course_organizations_generation() is not None
+        assert caching.course_organizations_generation() == cache.get(caching.COURSE_ORGANIZATIONS_GENERATION_KEY)
+
+    def test_generation_is_bumped_once_in_autocommit(self):
+        generation = caching.course_organizations_generation()
+        with patch.object(caching.transaction, 'get_connection') as mock_get_connection:
+            mock_get_connection.return_value.in_atomic_block = False
+            with self.captureOnCommitCallbacks() as callbacks:
+                caching.invalidate_course_organizations()
+        assert not callbacks
+        assert caching.course_organizations_generation() == generation + 1
+
+    def test_generation_is_bumped_on_commit(self):
+        generation = caching.course_organizations_generation()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            caching.invalidate_course_organizations()
+            assert caching.course_organizations_generation() == generation + 1
+        assert len(callbacks) == 1
+        assert caching.course_organizations_generation() == generation + 2
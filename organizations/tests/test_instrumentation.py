@@ -0,0 +1,163 @@
+"""
+Tests for the instrumentation of API calls.
+"""
+from unittest.mock import patch
+
+from django.db import DatabaseError
+from django.test import override_settings
+from django.urls import reverse
+
+from organizations import api
+from organizations import instrumentation
+from organizations.tests import utils
+from organizations.tests.factories import UserFactory
+
+
+class FailingSink(instrumentation.Sink):
+    """
+    A sink which cannot record anything.
+    """
+
+    def record(self, call):
+        raise ValueError
+
+
+@override_settings(ORGANIZATIONS_INSTRUMENTATION_ENABLED=True)
+class InstrumentationTestCase(utils.OrganizationsTestCaseBase):
+    """
+    Tests for `instrumentation.instrument` and the default sinks.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.sink = instrumentation.get_sinks()[1]
+        self.sink.reset()
+        self.addCleanup(self.sink.reset)
+        self.organization = api.add_organization(self.make_organization_data('org_a'))
+        self.sink.reset()
+
+    def test_records_calls(self):
+        with self.assertLogs(instrumentation.log, level='DEBUG') as logs:
+            api.get_organization(self.organization['id'])
+            api.get_organization(self.organization['id'])
+        summary = self.sink.summary()
+        assert list(summary) == ['organizations.api.get_organization']
+        statistics = summary['organizations.api.get_organization']
+        assert statistics['calls'] == 2
+        assert statistics['queries_per_call'] == statistics['max_queries'] == 1
+        assert 0 < statistics['p50_ms'] <= statistics['p99_ms']
+        assert 0 < statistics['query_ms_per_call'] <= statistics['p99_ms']
+        assert "organizations.api.get_organization took" in logs.output[0]
+        assert "ran 1 queries" in logs.output[0]
+
+    def test_nested_calls_count_towards_outermost_call(self):
+        # ensure_organization calls is_autocreate_enabled.
+        api.ensure_organization('org_b')
+        summary = self.sink.summary()
+        assert list(summary) == ['organizations.api.ensure_organization']
+        assert summary['organizations.api.ensure_organization']['max_queries'] > 1
+
+    def test_records_failed_calls(self):
+        with self.assertLogs(instrumentation.log, level='DEBUG') as logs:
+            with self.assertRaises(api.exceptions.InvalidOrganizationException):
+                api.get_organization_by_short_name('missing')
+        assert self.sink.summary()['organizations.api.get_organization_by_short_name']['calls'] == 1
+        assert "before failing" in logs.output[0]
+        # The failed call does not leave the instrumentation thinking it is still running.
+        api.get_organizations()
+        assert 'organizations.api.get_organizations' in self.sink.summary()
+
+    @override_settings(ORGANIZATIONS_INSTRUMENTATION_MAX_SAMPLES=2)
+    def test_percentiles_over_kept_samples(self):
+        sink = instrumentation.InMemorySink()
+        for duration in (0.5, 0.001, 0.002, 0.003):
+            sink.record(instrumentation.CallRecord('f', duration, 1, 0.0, True))
+        statistics = sink.summary()['f']
+        assert statistics['calls'] == 4
+        assert (statistics['p50_ms'], statistics['p99_ms']) == (2, 3)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        assert instrumentation._percentile(values, 50) == 50  # pylint: disable=protected-access
+        assert instrumentation._percentile(values, 99) == 99  # pylint: disable=protected-access
+        assert instrumentation._percentile([7], 99) == 7  # pylint: disable=protected-access
+
+    @override_settings(ORGANIZATIONS_INSTRUMENTATION_SINKS=['organizations.tests.test_instrumentation.FailingSink'])
+    def test_failing_sink(self):
+        with self.assertLogs(instrumentation.log, level='ERROR'):
+            assert api.get_organization(self.organization['id']) == self.organization
+
+    def test_base_sink(self):
+        with self.assertRaises(TypeError):
+            instrumentation.Sink()  # pylint: disable=abstract-class-instantiated
+
+    @override_settings(ORGANIZATIONS_INSTRUMENTATION_ENABLED=False)
+    def test_disabled(self):
+        with patch.object(instrumentation, '_emit') as mock_emit:
+            api.get_organizations()
+        mock_emit.assert_not_called()
+        assert not self.sink.summary()
+
+
+@override_settings(ORGANIZATIONS_SLOW_CALL_THRESHOLD=0)
+class SlowCallLogTestCase(utils.OrganizationsTestCaseBase):
+    """
+    Tests for the slow call log.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.organization = api.add_organization(self.make_organization_data('org_a'))
+
+    def test_logs_slow_calls(self):
+        with self.assertLogs(instrumentation.log, level='WARNING') as logs:
+            api.get_organization_by_short_name('org_a', case_insensitive=True)
+        [output] = logs.output
+        assert (
+            "Slow call to organizations.api.get_organization_by_short_name('org_a', case_insensitive=True)"
+        ) in output
+        assert 'SELECT' in output
+        assert 'Query plan of the slowest statement:' in output
+
+    def test_logs_view_requests(self):
+        user = UserFactory(password='test', is_superuser=True)
+        self.client.login(username=user.username, password='test')
+        with self.assertLogs(instrumentation.log, level='WARNING') as logs:
+            self.client.get(reverse('v0:organization-list'), {'page_size': 1})
+        [output] = logs.output
+        assert "Slow call to organizations.v0.views.OrganizationsViewSet.GET(" in output
+        assert "('/v0/organizations/?page_size=1')" in output
+
+    @override_settings(ORGANIZATIONS_SLOW_CALL_THRESHOLD=60)
+    def test_fast_calls_are_not_logged(self):
+        with self.assertNoLogs(instrumentation.log, level='WARNING'):
+            api.get_organization(self.organization['id'])
+
+    def test_call_without_queries(self):
+        with self.assertLogs(instrumentation.log, level='WARNING') as logs:
+            with instrumentation.measure('nothing'):
+                pass
+        assert 'Slow call to nothing() took' in logs.output[0]
+        assert 'Query plan' not in logs.output[0]
+
+    def test_query_plan_unavailable(self):
+        with patch.object(instrumentation, '_explain', return_value=None):
+            with self.assertLogs(instrumentation.log, level='WARNING') as logs:
+                api.get_organization(self.organization['id'])
+        assert 'SELECT' in logs.output[0]
+        assert 'Query plan' not in logs.output[0]
+
+    def test_statements_are_capped(self):
+        with patch.object(instrumentation, 'MAX_SLOW_CALL_STATEMENTS', 1):
+            with self.assertLogs(instrumentation.log, level='WARNING') as logs:
+                api.add_organization(self.make_organization_data('org_b'))
+        assert 'more statements' in logs.output[0]
+
+    def test_query_plan_is_skipped_for_executemany(self):
+        statement = instrumentation._Statement('INSERT INTO t VALUES (%s)', [(1,), (2,)], True, 1.0)  # pylint: disable=protected-access
+        assert instrumentation._explain(statement) is None  # pylint: disable=protected-access
+
+    def test_query_plan_is_skipped_on_errors(self):
+        statement = instrumentation._Statement('SELECT 1', None, False, 1.0)  # pylint: disable=protected-access
+        with patch('django.db.backends.utils.CursorWrapper.execute', side_effect=DatabaseError):
+            assert instrumentation._explain(statement) is None  # pylint: disable=protected-access
@@ -0,0 +1,269 @@
+"""
+Tests for the background ingestion of organization logos.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import httpretty
+import requests
+from django.test import override_settings
+from django.urls import reverse
+
+from organizations import api
+from organizations import logos
+from organizations.models import Organization, OrganizationLogoFetch
+from organizations.tests import utils
+from organizations.tests.factories import OrganizationFactory, UserFactory
+
+LOGO_URL = 'https://cdn.example.com/logos/example.png'
+LOGO_CONTENT = b'not really a png'
+LOGO_NAME = f'organization_logos/{hashlib.sha256(LOGO_CONTENT).hexdigest()}.png'
+
+
+@override_settings(
+    ORGANIZATIONS_LOGO_FETCHER='organizations.logos.SynchronousLogoFetcher',
+    ORGANIZATIONS_LOGO_FETCH_RETRY_DELAY=0,
+)
+class LogoFetchTestCase(utils.OrganizationsTestCaseBase):
+    """
+    Tests for scheduling and running logo downloads.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media_root_override = override_settings(MEDIA_ROOT=self.media_root)
+        media_root_override.enable()
+        self.addCleanup(media_root_override.disable)
+        self.organization = OrganizationFactory.create()
+
+    def assert_logo_status(self, status, attempts, error=''):
+        """
+        Assert the recorded state of the organization's logo download.
+        """
+        logo_status = api.get_organization_logo_status(self.organization.id)
+        assert logo_status['source_url'] == LOGO_URL
+        assert logo_status['status'] == status
+        assert logo_status['attempts'] == attempts
+        assert logo_status['error'] == error
+
+    @httpretty.activate
+    def test_put_fetches_logo_after_commit(self):
+        httpretty.register_uri(httpretty.GET, LOGO_URL, body=LOGO_CONTENT)
+        user = UserFactory(is_superuser=True)
+        self.client.force_login(user)
+        url = reverse('v0:organization-detail', kwargs={'short_name': self.organization.short_name})
+        payload = {'name': 'With logo', 'short_name': self.organization.short_name, 'logo_url': LOGO_URL}
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.put(url, json.dumps(payload), content_type='application/json')
+        assert response.status_code == 200
+        # The response does not wait for the download.
+        assert not httpretty.latest_requests()
+        assert response.data['logo_status'] == OrganizationLogoFetch.PENDING
+        self.assert_logo_status(OrganizationLogoFetch.PENDING, 0)
+
+        for callback in callbacks:
+            callback()
+        self.assert_logo_status(OrganizationLogoFetch.SUCCEEDED, 1)
+        organization = Organization.objects.get(id=self.organization.id)
+        assert organization.logo.name == LOGO_NAME
+        assert organization.logo.read() == LOGO_CONTENT
+        # Clients learn when the logo is ready through the API.
+        assert self.client.get(url).data['logo_status'] == OrganizationLogoFetch.SUCCEEDED
+
+    def test_no_logo_url(self):
+        user = UserFactory(is_superuser=True)
+        self.client.force_login(user)
+        url = reverse('v0:organization-detail', kwargs={'short_name': 'new_org'})
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.put(
+                url, json.dumps({'name': 'New', 'short_name': 'new_org'}), content_type='application/json'
+            )
+        assert not callbacks
+        assert response.data['logo_status'] is None
+        assert api.get_organization_logo_status(Organization.objects.get(short_name='new_org').id) is None
+
+    @httpretty.activate
+    def test_retries_server_errors(self):
+        httpretty.register_uri(httpretty.GET, LOGO_URL, responses=[
+            httpretty.Response(body='', status=503),
+            httpretty.Response(body=LOGO_CONTENT, status=200),
+        ])
+        with self.captureOnCommitCallbacks(execute=True):
+            logos.schedule_logo_fetch(self.organization, LOGO_URL)
+        self.assert_logo_status(OrganizationLogoFetch.SUCCEEDED, 2)
+
+    @override_settings(ORGANIZATIONS_LOGO_FETCH_RETRIES=1)
+    @httpretty.activate
+    def test_gives_up_after_retries(self):
+        httpretty.register_uri(httpretty.GET, LOGO_URL, body='', status=500)
+        with self.captureOnCommitCallbacks(execute=True):
+            logos.schedule_logo_fetch(self.organization, LOGO_URL)
+        self.assert_logo_status(OrganizationLogoFetch.FAILED, 2, 'HTTP 500')
+        assert not Organization.objects.get(id=self.organization.id).logo
+
+    @httpretty.activate
+    def test_does_not_retry_client_errors(self):
+        httpretty.register_uri(httpretty.GET, LOGO_URL, body='', status=404)
+        with self.captureOnCommitCallbacks(execute=True):
+            logos.schedule_logo_fetch(self.organization, LOGO_URL)
+        self.assert_logo_status(OrganizationLogoFetch.FAILED, 1, 'HTTP 404')
+
+    @override_settings(ORGANIZATIONS_LOGO_FETCH_TIMEOUT=3)
+    def test_network_errors(self):
+        with patch.object(logos.requests, 'get', side_effect=requests.Timeout('too slow')) as mock_get:
+            with self.captureOnCommitCallbacks(execute=True):
+                logos.schedule_logo_fetch(self.organization, LOGO_URL)
+        assert mock_get.call_count == 3
+        mock_get.assert_called_with(LOGO_URL, headers={}, timeout=3)
+        self.assert_logo_status(OrganizationLogoFetch.FAILED, 3, 'Timeout: too slow')
+
+    def test_superseded_download_is_skipped(self):
+        with self.captureOnCommitCallbacks():
+            logos.schedule_logo_fetch(self.organization, LOGO_URL)
+        with patch.object(logos.requests, 'get') as mock_get:
+            logos.fetch_logo(self.organization.id, 'https://cdn.example.com/logos/old.png')
+        mock_get.assert_not_called()
+        self.assert_logo_status(OrganizationLogoFetch.PENDING, 0)
+
+    @httpretty.activate
+    def test_unchanged_logo_is_not_stored_again(self):
+        httpretty.register_uri(httpretty.GET, LOGO_URL, body=LOGO_CONTENT)
+        with self.captureOnCommitCallbacks(execute=True):
+            logos.schedule_logo_fetch(self.organization, LOGO_URL)
+        modified = Organization.objects.get(id=self.organization.id).modified
+
+        with patch('django.core.files.storage.FileSystemStorage.save') as mock_save:
+            with self.captureOnCommitCallbacks(execute=True):
+                logos.schedule_logo_fetch(self.organization, LOGO_URL)
+        mock_save.assert_not_called()
+        assert Organization.objects.get(id=self.organization.id).modified == modified
+        self.assert_logo_status(OrganizationLogoFetch.SUCCEEDED, 1)
+
+    @httpretty.activate
+    def test_identical_logos_share_a_file(self):
+        httpretty.register_uri(httpretty.GET, LOGO_URL, body=LOGO_CONTENT)
+        other_url = 'https://other.example.com/Logo.PNG?size=large'
+        httpretty.register_uri(httpretty.GET, 'https://other.example.com/Logo.PNG', body=LOGO_CONTENT)
+        other_organization = OrganizationFactory.create()
+        with self.captureOnCommitCallbacks(execute=True):
+            logos.schedule_logo_fetch(self.organization, LOGO_URL)
+            logos.schedule_logo_fetch(other_organization, other_url)
+
+        assert Organization.objects.get(id=self.organization.id).logo.name == LOGO_NAME
+        assert Organization.objects.get(id=other_organization.id).logo.name == LOGO_NAME
+        assert os.listdir(os.path.join(self.media_root, 'organization_logos')) == [os.path.basename(LOGO_NAME)]
+
+    @httpretty.activate
+    def test_revalidates_logo_from_same_url(self):
+        last_modified = 'Wed, 21 Oct 2026 07:28:00 GMT'
+        httpretty.register_uri(httpretty.GET, LOGO_URL, responses=[
+            httpretty.Response(body=LOGO_CONTENT, etag='"v1"', last_modified=last_modified),
+            httpretty.Response(body='', status=304),
+        ])
+        with self.captureOnCommitCallbacks(execute=True):
+            logos.schedule_logo_fetch(self.organization, LOGO_URL)
+        assert 'If-None-Match' not in httpretty.last_request().headers
+        logo_fetch = OrganizationLogoFetch.objects.get(organization=self.organization)
+        assert (logo_fetch.etag, logo_fetch.last_modified) == ('"v1"', last_modified)
+
+        with patch.object(logos, 'store_logo') as mock_store_logo:
+            with self.captureOnCommitCallbacks(execute=True):
+                logos.schedule_logo_fetch(self.organization, LOGO_URL)
+        assert httpretty.last_request().headers['If-None-Match'] == '"v1"'
+        assert httpretty.last_request().headers['If-Modified-Since'] == last_modified
+        mock_store_logo.assert_not_called()
+        self.assert_logo_status(OrganizationLogoFetch.SUCCEEDED, 1)
+        logo_fetch.refresh_from_db()
+        assert (logo_fetch.etag, logo_fetch.last_modified) == ('"v1"', last_modified)
+
+    @httpretty.activate
+    def test_new_url_is_not_revalidated(self):
+        other_url = 'https://cdn.example.com/logos/other.png'
+        httpretty.register_uri(httpretty.GET, LOGO_URL, body=LOGO_CONTENT, etag='"v1"')
+        httpretty.register_uri(httpretty.GET, other_url, body=b'other logo')
+        with self.captureOnCommitCallbacks(execute=True):
+            logos.schedule_logo_fetch(self.organization, LOGO_URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            logos.schedule_logo_fetch(self.organization, other_url)
+        assert 'If-None-Match' not in httpretty.last_request().headers
+        logo_fetch = OrganizationLogoFetch.objects.get(organization=self.organization)
+        assert (logo_fetch.source_url, logo_fetch.etag) == (other_url, '')
+
+    @httpretty.activate
+    def test_missing_logo_is_not_revalidated(self):
+        httpretty.register_uri(httpretty.GET, LOGO_URL, body=LOGO_CONTENT, etag='"v1"')
+        with self.captureOnCommitCallbacks(execute=True):
+            logos.schedule_logo_fetch(self.organization, LOGO_URL)
+        Organization.objects.filter(id=self.organization.id).update(logo='')
+        with self.captureOnCommitCallbacks(execute=True):
+            logos.schedule_logo_fetch(self.organization, LOGO_URL)
+        assert 'If-None-Match' not in httpretty.last_request().headers
+        assert Organization.objects.get(id=self.organization.id).logo.name == LOGO_NAME
+
+    @httpretty.activate
+    def test_storage_errors_are_recorded(self):
+        httpretty.register_uri(httpretty.GET, LOGO_URL, body=LOGO_CONTENT)
+        with patch('django.core.files.storage.FileSystemStorage.save', side_effect=OSError('disk full')):
+            with self.assertLogs(logos.log, level='ERROR'):
+                with self.captureOnCommitCallbacks(execute=True):
+                    logos.schedule_logo_fetch(self.organization, LOGO_URL)
+        self.assert_logo_status(OrganizationLogoFetch.FAILED, 1, 'OSError: disk full')
+        assert not Organization.objects.get(id=self.organization.id).logo
+
+    @httpretty.activate
+    def test_changes_during_download_are_kept(self):
+        httpretty.register_uri(httpretty.GET, LOGO_URL, body=LOGO_CONTENT)
+        download = logos._download  # pylint: disable=protected-access
+
+        def download_while_organization_changes(*args):
+            Organization.objects.filter(id=self.organization.id).update(name='Renamed', active=False)
+            return download(*args)
+
+        with patch.object(logos, '_download', side_effect=download_while_organization_changes):
+            with self.captureOnCommitCallbacks(execute=True):
+                logos.schedule_logo_fetch(self.organization, LOGO_URL)
+        organization = Organization.objects.get(id=self.organization.id)
+        assert (organization.name, organization.active, organization.logo.name) == ('Renamed', False, LOGO_NAME)
+
+    def test_content_addressed_logo_name(self):
+        digest = hashlib.sha256(LOGO_CONTENT).hexdigest()
+        assert logos.content_addressed_logo_name(LOGO_URL, LOGO_CONTENT) == f'{digest}.png'
+        assert logos.content_addressed_logo_name('https://cdn.example.com/logo', LOGO_CONTENT) == digest
+        assert logos.content_addressed_logo_name('https://cdn.example.com/logo.p?g', LOGO_CONTENT) == digest + '.p'
+        assert logos.content_addressed_logo_name('https://cdn.example.com/a.b c', LOGO_CONTENT) == digest
+
+
+class LogoFetcherTestCase(utils.OrganizationsTestCaseBase):
+    """
+    Tests for the logo fetchers.
+    """
+
+    def test_default_fetcher(self):
+        assert isinstance(logos.get_logo_fetcher(), logos.ThreadPoolLogoFetcher)
+
+    def test_base_fetcher(self):
+        with self.assertRaises(TypeError):
+            logos.LogoFetcher()  # pylint: disable=abstract-class-instantiated
+
+    @override_settings(ORGANIZATIONS_LOGO_FETCH_MAX_WORKERS=1)
+    def test_thread_pool_fetcher(self):
+        self.addCleanup(setattr, logos.ThreadPoolLogoFetcher, '_executor', None)
+        fetcher = logos.ThreadPoolLogoFetcher()
+        with patch.object(logos, 'fetch_logo') as mock_fetch_logo, \
+                patch.object(logos, 'close_old_connections') as mock_close_old_connections:
+            fetcher.submit(1, LOGO_URL).result()
+            mock_fetch_logo.side_effect = ValueError
+            with self.assertLogs(logos.log, level='ERROR'):
+                fetcher.submit(2, LOGO_URL).result()
+        mock_fetch_logo.assert_any_call(1, LOGO_URL)
+        mock_fetch_logo.assert_any_call(2, LOGO_URL)
+        assert mock_close_old_connections.call_count == 2
+        assert logos.ThreadPoolLogoFetcher._executor._max_workers == 1  # pylint: disable=protected-access
+        logos.ThreadPoolLogoFetcher._executor.shutdown()  # pylint: disable=protected-access
@@ -1,10 +1,14 @@
 """
 Tests for Organization Model.
 """
+from unittest import skipUnless
 
 import ddt
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
+from organizations import data
+from organizations.models import OrganizationCourse, OrganizationLogoFetch
 from organizations.tests.factories import OrganizationFactory
 
 
@@ -37,3 +41,37 @@ class TestOrganizationModel(TestCase):
         for valid_short_name in valid_short_name_list:
             self.organization.short_name = valid_short_name
             self.assertEqual(self.organization.clean(), None)
+
+
+class TestOrganizationLogoFetchModel(TestCase):
+    """ OrganizationLogoFetch model tests. """
+    def test_str(self):
+        organization = OrganizationFactory.create(short_name='logo_org')
+        logo_fetch = OrganizationLogoFetch.objects.create(
+            organization=organization, source_url='https://cdn.example.com/logo.png'
+        )
+        self.assertEqual(str(logo_fetch), 'logo_org: https://cdn.example.com/logo.png (pending)')
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Query plans are checked on SQLite only.')
+class TestIndexes(TestCase):
+    """ Checks that the common lookups are served by indexes. """
+
+    def query_plan(self, queryset):
+        """ Return the SQLite query plan of a queryset, as a single string. """
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return ' '.join(str(row[-1]) for row in cursor.fetchall())
+
+    def test_course_lookup_uses_index(self):
+        queryset = OrganizationCourse.objects.filter(course_id='course-v1:edX+DemoX+Demo', active=True)
+        self.assertIn('USING INDEX orgcourse_course_active_idx', self.query_plan(queryset))
+
+    def test_organization_lookup_uses_index(self):
+        queryset = OrganizationCourse.objects.filter(organization_id=1, active=True)
+        self.assertIn('USING INDEX orgcourse_org_active_idx', self.query_plan(queryset))
+
+    def test_case_insensitive_short_name_lookup_uses_index(self):
+        queryset = data.query_organizations_by_short_name(['edX', 'MITx'])
+        self.assertIn('USING INDEX organization_short_name_ci_idx', self.query_plan(queryset))
@@ -0,0 +1,127 @@
+"""
+Tests for the in-memory organization registry.
+"""
+from unittest.mock import Mock, patch
+
+from django.db import transaction
+from django.test import override_settings
+
+from organizations import api
+from organizations import registry
+from organizations.models import Organization
+from organizations.tests import utils
+
+
+@override_settings(ORGANIZATIONS_REGISTRY_ENABLED=True, ORGANIZATIONS_REGISTRY_CHECK_INTERVAL=60)
+class OrganizationRegistryTestCase(utils.OrganizationsTransactionTestCaseBase):
+    """
+    Tests for `registry.OrganizationRegistry` and the data functions it serves.
+
+    Writes are committed, as the registry is not used by a transaction which
+    has written organizations.
+    """
+
+    def setUp(self):
+        super().setUp()
+        registry.organization_registry.clear()
+        self.addCleanup(registry.organization_registry.clear)
+        self.organization = api.add_organization(self.make_organization_data('org_a'))
+        self.inactive_organization = api.add_organization(self.make_organization_data('org_b'))
+        api.remove_organization(self.inactive_organization['id'])
+        self.now = 1000
+        monotonic_patcher = patch.object(registry.time, 'monotonic', side_effect=lambda: self.now)
+        monotonic_patcher.start()
+        self.addCleanup(monotonic_patcher.stop)
+
+    def test_lookups_are_served_from_memory(self):
+        # Check the version stamp, then load the organizations.
+        with self.assertNumQueries(2):
+            assert api.get_organization(self.organization['id']) == self.organization
+        with self.assertNumQueries(0):
+            assert api.get_organization(str(self.organization['id'])) == self.organization
+            assert api.get_organization_by_short_name('org_a') == self.organization
+            assert api.get_organization_by_short_name('ORG_A', case_insensitive=True) == self.organization
+            assert api.get_organizations() == [self.organization]
+
+    def test_missing_and_inactive_organizations(self):
+        with self.assertRaises(api.exceptions.InvalidOrganizationException):
+            api.get_organization(self.inactive_organization['id'])
+        with self.assertRaises(api.exceptions.InvalidOrganizationException):
+            api.get_organization('not an id')
+        with self.assertRaises(api.exceptions.InvalidOrganizationException):
+            api.get_organization_by_short_name('org_b')
+        with self.assertRaises(api.exceptions.InvalidOrganizationException):
+            api.get_organization_by_short_name('ORG_A')
+
+    def test_case_insensitive_lookup_prefers_exact_match(self):
+        upper = api.add_organization({'short_name': 'ORG_A', 'name': 'Upper'})
+        assert api.get_organization_by_short_name('ORG_A', case_insensitive=True) == upper
+        assert api.get_organization_by_short_name('org_a', case_insensitive=True) == self.organization
+        assert api.get_organization_by_short_name('Org_A', case_insensitive=True) == self.organization
+
+    def test_exact_lookup_follows_database_collation(self):
+        # Like SQLite, case-sensitive.
+        assert registry.organization_registry.get_by_short_name('ORG_A') is None
+        # Like MySQL, case-insensitive.
+        with patch.object(registry, 'connection', Mock(vendor='mysql')):
+            assert api.get_organization_by_short_name('ORG_A') == self.organization
+            assert api.get_organization_by_short_name('org_a') == self.organization
+            with self.assertRaises(api.exceptions.InvalidOrganizationException):
+                api.get_organization_by_short_name('org_b')
+
+    def test_stamp_is_checked_every_interval(self):
+        api.get_organizations()
+        self.now += 59
+        with self.assertNumQueries(0):
+            api.get_organizations()
+        self.now += 1
+        # Only check the version stamp, as nothing changed.
+        with self.assertNumQueries(1):
+            api.get_organizations()
+
+    def test_changes_from_other_processes_are_seen_after_interval(self):
+        api.get_organizations()
+        # Neither signals nor cache invalidation: as if written by another process.
+        Organization.objects.bulk_create([Organization(short_name='org_c', name='Org C')])
+        assert len(api.get_organizations()) == 1
+        self.now += 60
+        with self.assertNumQueries(2):
+            assert len(api.get_organizations()) == 2
+
+    def test_local_writes_are_seen_immediately(self):
+        api.get_organizations()
+        api.remove_organization(self.organization['id'])
+        assert api.get_organizations() == []
+        api.add_organization(self.make_organization_data('org_b'))
+        assert [organization['short_name'] for organization in api.get_organizations()] == ['org_b']
+
+    def test_ensure_organization(self):
+        organization = api.ensure_organization('org_c')
+        api.get_organizations()
+        with self.assertNumQueries(0):
+            assert api.ensure_organization('org_c') == organization
+
+    def test_rolled_back_organizations_are_not_kept(self):
+        api.get_organizations()
+        with transaction.atomic():
+            api.add_organization(self.make_organization_data('org_c'))
+            # Read from the database, without building a snapshot.
+            with self.assertNumQueries(1):
+                assert len(api.get_organizations()) == 2
+            transaction.set_rollback(True)
+        # Only check the version stamp, as the snapshot was kept.
+        with self.assertNumQueries(1):
+            assert api.get_organizations() == [self.organization]
+
+    def test_committed_organizations_are_seen(self):
+        api.get_organizations()
+        with transaction.atomic():
+            api.add_organization(self.make_organization_data('org_c'))
+            api.get_organizations()
+        assert len(api.get_organizations()) == 2
+
+    @override_settings(ORGANIZATIONS_REGISTRY_ENABLED=False)
+    def test_disabled(self):
+        api.get_organizations()
+        with self.assertNumQueries(1):
+            api.get_organizations()
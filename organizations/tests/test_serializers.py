@@ -31,5 +31,6 @@ class TestOrganizationSerializer(TestCase):
             "active": self.organization.active,
             "created": datetime_field.to_representation(self.organization.created),
             "modified": datetime_field.to_representation(self.organization.modified),
+            "logo_status": None,
         }
         self.assertEqual(serialize_data.data, expected)
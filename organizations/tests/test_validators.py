@@ -0,0 +1,47 @@
+"""
+Tests for the validators module.
+"""
+from unittest.mock import patch
+
+import ddt
+from django.test import TestCase
+from opaque_keys.edx.keys import CourseKey
+
+from organizations import validators
+
+
+@ddt.ddt
+class CourseKeyIsValidTestCase(TestCase):
+    """
+    Tests for `validators.course_key_is_valid`.
+    """
+
+    def setUp(self):
+        super().setUp()
+        validators._course_key_string_is_valid.cache_clear()  # pylint: disable=protected-access
+
+    @ddt.data(
+        ("course-v1:edX+DemoX+Demo_Course", True),
+        ("edX/DemoX/Demo_Course", True),
+        ("NOT-A-COURSE-KEY", False),
+        ("", False),
+        (None, False),
+    )
+    @ddt.unpack
+    def test_course_key_strings(self, course_key, expected):
+        assert validators.course_key_is_valid(course_key) is expected
+
+    def test_course_key_objects_are_not_reparsed(self):
+        course_key = CourseKey.from_string("course-v1:edX+DemoX+Demo_Course")
+        with patch.object(validators.CourseKey, "from_string") as mock_from_string:
+            assert validators.course_key_is_valid(course_key)
+        mock_from_string.assert_not_called()
+
+    def test_course_key_strings_are_memoized(self):
+        with patch.object(
+            validators.CourseKey, "from_string", wraps=validators.CourseKey.from_string
+        ) as mock_from_string:
+            for _ in range(3):
+                assert validators.course_key_is_valid("course-v1:edX+DemoX+Demo_Course")
+                assert not validators.course_key_is_valid("NOT-A-COURSE-KEY")
+        assert mock_from_string.call_count == 2
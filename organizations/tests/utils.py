@@ -1,14 +1,14 @@
 """
 Utility module for Organizations test cases
 """
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 
 from opaque_keys.edx.keys import CourseKey
 
 
-class OrganizationsTestCaseBase(TestCase):
+class OrganizationsTestCaseMixin:
     """
-    Parent/Base class for Organizations test cases
+    Scaffolding shared by Organizations test cases
     """
 
     def setUp(self):
@@ -30,3 +30,16 @@ class OrganizationsTestCaseBase(TestCase):
             'name': f"Name of {short_name}",
             'description': f"Description of {short_name}",
         }
+
+
+class OrganizationsTestCaseBase(OrganizationsTestCaseMixin, TestCase):
+    """
+    Parent/Base class for Organizations test cases
+    """
+
+
+class OrganizationsTransactionTestCaseBase(OrganizationsTestCaseMixin, TransactionTestCase):
+    """
+    Parent/Base class for Organizations test cases whose writes are committed,
+    e.g. to test what happens on commit or rollback
+    """
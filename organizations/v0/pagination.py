@@ -0,0 +1,14 @@
+"""
+Pagination classes for organizations end points.
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class OrganizationsCursorPagination(CursorPagination):
+    """
+    Keyset pagination over organizations, ordered by the primary key.
+
+    Unlike page number pagination, this does not count the rows nor scan past
+    an offset, so every page costs the same as the first one.
+    """
+    ordering = 'id'
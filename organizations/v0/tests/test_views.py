@@ -2,11 +2,20 @@
 Organizations Views Test Cases.
 """
 import json
+from datetime import timedelta
+
 import ddt
+import httpretty
+from django.db import connection
 from django.urls import reverse
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
 
-from organizations.models import Organization
+from organizations import api
+from organizations import logos
+from organizations.models import Organization, OrganizationLogoFetch
 from organizations.serializers import OrganizationSerializer
 from organizations.tests.factories import UserFactory, OrganizationFactory
 
@@ -41,6 +50,151 @@ class TestOrganizationsView(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data['results']), 2)
 
+    def test_cursor_pagination(self):
+        """ Verify that the list can be walked with cursor pagination, without counting rows."""
+        OrganizationFactory.create_batch(24)
+        OrganizationFactory.create_batch(2, active=False)
+        short_names = []
+        url = self.organization_list_url + '?pagination=cursor'
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            self.assertFalse(any('COUNT(' in query['sql'] for query in queries.captured_queries))
+            short_names.extend(organization['short_name'] for organization in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(len(short_names), 25)
+        self.assertEqual(
+            short_names,
+            list(Organization.objects.filter(active=True).order_by('id').values_list('short_name', flat=True))
+        )
+
+    def test_page_number_pagination_is_ordered(self):
+        """ Verify that page number pagination remains the default, in a deterministic order."""
+        OrganizationFactory.create_batch(24)
+        response = self.client.get(self.organization_list_url, {'page': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(
+            [organization['id'] for organization in response.data['results']],
+            list(Organization.objects.order_by('id').values_list('id', flat=True)[20:])
+        )
+
+    def test_list_conditional_get(self):
+        """ Verify that the list is answered with 304 while it has not changed."""
+        response = self.client.get(self.organization_list_url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(3):  # Session, user and the aggregate query.
+            response = self.client.get(self.organization_list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        response = self.client.get(
+            self.organization_list_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(response.status_code, 304)
+
+        # Another page is another representation.
+        response = self.client.get(self.organization_list_url, {'page_size': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        # Deactivating an organization changes the list.
+        api.remove_organization(self.organization.pk)
+        response = self.client.get(self.organization_list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_last_modified_after_removal(self):
+        """ Verify that removing an organization other than the latest one moves Last-Modified."""
+        newer_organization = OrganizationFactory.create()
+        Organization.objects.update(modified=timezone.now() - timedelta(hours=1))
+        Organization.objects.filter(pk=newer_organization.pk).update(modified=timezone.now() - timedelta(minutes=1))
+        last_modified = self.client.get(self.organization_list_url)['Last-Modified']
+
+        api.remove_organization(self.organization.pk)
+        response = self.client.get(self.organization_list_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_cursor_list_conditional_get(self):
+        """ Verify conditional GETs of cursor-paginated pages."""
+        url = self.organization_list_url + '?pagination=cursor'
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.organization.name = 'changed-name'
+        self.organization.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['name'], 'changed-name')
+        self.assertNotIn('Last-Modified', response)
+
+        # An organization dropping off the page changes the page.
+        other_organization = OrganizationFactory.create()
+        etag = self.client.get(url)['ETag']
+        api.remove_organization(other_organization.pk)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_single_organization_conditional_get(self):
+        """ Verify that a single organization is answered with 304 while it has not changed."""
+        url = self._get_organization_url(self.organization)
+        response = self.client.get(url)
+        etag = response['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+        self.organization.description = 'changed-description'
+        self.organization.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['description'], 'changed-description')
+
+    @httpretty.activate
+    def test_conditional_get_after_logo_fetch(self):
+        """ Verify that the outcome of a logo download changes the representations which include it."""
+        logo_url = 'https://example.com/logo.png'
+        httpretty.register_uri(httpretty.GET, logo_url, status=404)
+        OrganizationLogoFetch.objects.create(organization=self.organization, source_url=logo_url)
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        Organization.objects.update(modified=an_hour_ago)
+        OrganizationLogoFetch.objects.update(modified=an_hour_ago)
+        urls = [
+            self.organization_list_url,
+            self.organization_list_url + '?pagination=cursor',
+            self._get_organization_url(self.organization),
+        ]
+        responses = [self.client.get(url) for url in urls]
+
+        with self.assertLogs(logos.log, level='WARNING'):
+            logos.fetch_logo(self.organization.pk, logo_url)
+        for url, response in zip(urls, responses):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, 200)
+            data = response.data['results'][0] if 'results' in response.data else response.data
+            self.assertEqual(data['logo_status'], OrganizationLogoFetch.FAILED)
+        response = self.client.get(urls[2], HTTP_IF_MODIFIED_SINCE=http_date(an_hour_ago.timestamp()))
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(USE_TZ=True)
+    def test_conditional_get_with_time_zones(self):
+        """ Verify Last-Modified with time zone aware datetimes."""
+        organization = OrganizationFactory.create()
+        url = self._get_organization_url(organization)
+        response = self.client.get(url)
+        self.assertEqual(response['Last-Modified'], http_date(organization.modified.timestamp()))
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
     def test_single_organization(self):
         """verify single organization data could be fetched using short name"""
         url = self._get_organization_url(self.organization)
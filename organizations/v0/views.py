@@ -1,7 +1,14 @@
 """
 Views for organizations end points.
 """
+import hashlib
+from functools import partial
+
+from django.db.models import Count, Max
 from django.http import Http404
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from edx_rest_framework_extensions.auth.jwt.authentication import JwtAuthentication
 from rest_framework import mixins
 from rest_framework import status
@@ -11,17 +18,38 @@ from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from organizations.models import Organization
+from organizations.instrumentation import measure
+from organizations.models import Organization, OrganizationLogoFetch
 from organizations.permissions import UserIsStaff
 from organizations.serializers import OrganizationSerializer
+from organizations.v0.pagination import OrganizationsCursorPagination
+
+
+def _last_modified(organization):
+    """
+    Return the latest modification time of an organization and of its logo download.
+    """
+    try:
+        return max(organization.modified, organization.logo_fetch.modified)
+    except OrganizationLogoFetch.DoesNotExist:
+        return organization.modified
 
 
 class OrganizationsViewSet(mixins.UpdateModelMixin, viewsets.ReadOnlyModelViewSet):
     """
     Organization view to:
         - list organization data (GET .../)
+          Add ``?pagination=cursor`` to page through the list with keyset (cursor)
+          pagination rather than page numbers.
         - retrieve single organization (GET .../<short_name>)
         - create or update an organization via the PUT endpoint (PUT .../<short_name>)
+
+    GET responses carry ``ETag`` and ``Last-Modified`` headers, and requests with
+    ``If-None-Match`` / ``If-Modified-Since`` are answered with 304 Not Modified,
+    without serializing anything, while the data has not changed. The data
+    includes the status of the organizations' logo downloads (``logo_status``).
+
+    Requests are measured like calls to api.py (see instrumentation.py).
     """
     queryset = Organization.objects.all()
     serializer_class = OrganizationSerializer
@@ -31,6 +59,14 @@ class OrganizationsViewSet(mixins.UpdateModelMixin, viewsets.ReadOnlyModelViewSe
     authentication_classes = (JwtAuthentication, SessionAuthentication)
     permission_classes = (IsAuthenticated, UserIsStaff)
 
+    def dispatch(self, request, *args, **kwargs):
+        """
+        Handle the request, measuring it as a call named after the view and HTTP method.
+        """
+        function_name = f'{self.__module__}.{self.__class__.__name__}.{request.method}'
+        with measure(function_name, (request.get_full_path(),), kwargs):
+            return super().dispatch(request, *args, **kwargs)
+
     def get_queryset(self):
         """
         Get the queryset to use in the request.
@@ -43,9 +79,100 @@ class OrganizationsViewSet(mixins.UpdateModelMixin, viewsets.ReadOnlyModelViewSe
         organizations that exist internally but are inactive.
         """
         if self.request.method == "GET":
-            return self.queryset.filter(active=True)
+            return self.queryset.filter(active=True).select_related('logo_fetch').order_by('id')
         return self.queryset
 
+    @property
+    def paginator(self):
+        """
+        The paginator instance for this request.
+
+        Clients opt into keyset pagination with ``?pagination=cursor``;
+        the links to the next and previous pages keep that parameter.
+        """
+        if not hasattr(self, '_paginator') and self.request.query_params.get('pagination') == 'cursor':
+            self._paginator = OrganizationsCursorPagination()  # pylint: disable=attribute-defined-outside-init
+        return super().paginator
+
+    def list(self, request, *args, **kwargs):
+        """
+        List organizations, unless the client's copy of this page is still current.
+
+        With page number pagination, the validators come from one aggregate
+        query over every organization, active or not: the latest modification
+        time of organizations and of their logo downloads, and the number of
+        organizations. Deactivations update `modified` too, so any change to
+        the list moves one of them. With cursor pagination, the ETag comes from
+        the ids and modification times of the organizations on the requested
+        page, and of their logo downloads, so that no page costs a scan of
+        the whole table; such pages carry no ``Last-Modified``, as an
+        organization dropping off a page leaves no later modification time on it.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        if isinstance(self.paginator, OrganizationsCursorPagination):
+            page = self.paginate_queryset(queryset)
+            return self._conditional_response(
+                None,
+                ','.join(
+                    f'{organization.pk}:{_last_modified(organization).isoformat()}' for organization in page
+                ),
+                lambda: self.get_paginated_response(self.get_serializer(page, many=True).data),
+            )
+        stamp = self.queryset.aggregate(
+            last_modified=Max('modified'), logo_last_modified=Max('logo_fetch__modified'), count=Count('id'),
+        )
+        return self._conditional_response(
+            max(filter(None, (stamp['last_modified'], stamp['logo_last_modified'])), default=None),
+            stamp['count'],
+            partial(super().list, request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Retrieve an organization, unless the client's copy of it is still current.
+        """
+        instance = self.get_object()
+        return self._conditional_response(
+            _last_modified(instance),
+            instance.pk,
+            lambda: Response(self.get_serializer(instance).data),
+        )
+
+    def _conditional_response(self, last_modified, version, build_response):
+        """
+        Return a 304 response if the request's preconditions show that the
+        client has the current representation, otherwise `build_response()`,
+        setting the ``ETag`` and ``Last-Modified`` headers on either.
+
+        The ETag covers the full path (query parameters select the page)
+        and the negotiated media type, as well as the data's `version`
+        and `last_modified` time.
+        """
+        etag = quote_etag(hashlib.md5(
+            '|'.join((
+                self.request.get_full_path(),
+                self.request.accepted_media_type,
+                str(version),
+                last_modified.isoformat() if last_modified else '',
+            )).encode('utf-8'),
+            usedforsecurity=False,
+        ).hexdigest())
+        last_modified_timestamp = None
+        if last_modified:
+            if timezone.is_naive(last_modified):
+                last_modified = timezone.make_aware(last_modified)
+            last_modified_timestamp = int(last_modified.timestamp())
+
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=last_modified_timestamp,
+        )
+        if response is None:
+            response = build_response()
+        response['ETag'] = etag
+        if last_modified_timestamp is not None:
+            response['Last-Modified'] = http_date(last_modified_timestamp)
+        return response
+
     def update(self, request, *args, **kwargs):
         """
         We perform both Update and Create action via the PUT method.
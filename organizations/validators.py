@@ -1,23 +1,40 @@
 """
 Validators confirm the integrity of inbound information prior to a data.py handoff
 """
+from functools import lru_cache
+
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
 
 
-def course_key_is_valid(course_key):
+# Number of distinct course key strings whose validity we remember.
+COURSE_KEY_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=COURSE_KEY_CACHE_SIZE)
+def _course_key_string_is_valid(course_key_string):
     """
-    Course key object validation
+    Course key string validation, memoized as parsing is comparatively expensive
     """
-    if course_key is None:
-        return False
     try:
-        CourseKey.from_string(str(course_key))
+        CourseKey.from_string(course_key_string)
     except (InvalidKeyError, UnicodeDecodeError):
         return False
     return True
 
 
+def course_key_is_valid(course_key):
+    """
+    Course key object validation
+    """
+    if course_key is None:
+        return False
+    if isinstance(course_key, CourseKey):
+        # Already parsed, so there is nothing to check.
+        return True
+    return _course_key_string_is_valid(str(course_key))
+
+
 def organization_data_is_valid(organization_data):
     """
     Organization data validation